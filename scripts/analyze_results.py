@@ -4,19 +4,246 @@ Benchmark Results Analysis Script
 Generates graphs and comparison tables for scientific paper
 """
 
+import argparse
+import hashlib
 import json
-import re
-import matplotlib.pyplot as plt
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
 
-# Set matplotlib to use non-interactive backend
-plt.switch_backend('Agg')
+# orjson is optional; fall back to the stdlib parser when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# pyplot is imported on first use so table-only runs skip its import cost
+_plt = None
+
+
+def _get_plt():
+    """Import and configure matplotlib.pyplot once, on first use"""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        # Set matplotlib to use non-interactive backend
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        # Name the font directly so findfont skips the sans-serif fallback search
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        _plt = plt
+    return _plt
+
+# Draft charts render at 150 dpi; --publication restores 300 dpi
+DRAFT_DPI = 150
+PUBLICATION_DPI = 300
+
+# Fast zlib level for PNG output, trading file size for encode time
+PNG_PIL_KWARGS = {'compress_level': 1}
+
+# Nmap tests in chart order
+NMAP_TESTS = ('common_ports', 'port_range', 'localhost', 'service_detection')
+
+def _time_to_seconds(time_str):
+    """Convert time string (H:MM:SS.ms, MM:SS.ms or S.ms) to seconds"""
+    if ':' not in time_str:
+        return float(time_str)
+    head, _, seconds = time_str.rpartition(':')
+    hours, _, minutes = head.rpartition(':')
+    return float(hours or 0) * 3600 + float(minutes) * 60 + float(seconds)
+
+
+# /usr/bin/time -v line label -> (metrics key, value parser)
+_TIME_FIELDS = {
+    'Elapsed (wall clock)': ('time', _time_to_seconds),
+    'Maximum resident set size': ('memory_kb', int),
+    'Percent of CPU': ('cpu_percent', lambda value: int(value.rstrip('%'))),
+}
+
+# Bar chart layouts keyed by output file:
+# (x tick labels, y label, title, bar color, value label format, y limits)
+BAR_CHARTS = {
+    'time_comparison.png': (
+        ['Common\nPorts\n(15)', 'Port Range\n(1-1000)', 'Localhost\n(1-1000)', 'Service\nDetection'],
+        'Время выполнения (секунды)', 'Сравнение времени выполнения сканирования',
+        '#2E86AB', '{:.2f}s', None),
+    'memory_comparison.png': (
+        ['Common\nPorts', 'Port Range', 'Localhost', 'Service\nDetection'],
+        'Использование памяти (MB)', 'Сравнение использования памяти',
+        '#A23B72', '{:.1f}MB', None),
+    'cpu_comparison.png': (
+        ['Common\nPorts', 'Port Range', 'Localhost', 'Service\nDetection'],
+        'Загрузка CPU (%)', 'Сравнение загрузки процессора',
+        '#F18F01', '{:.0f}%', (0, 100)),
+}
+
+# Bar charts share one Figure/Axes per process, created on first use and cleared between saves
+_bar_fig = _bar_ax = None
+
+
+def _bar_axes():
+    """Return the Axes shared by all bar charts, cleared for reuse"""
+    global _bar_fig, _bar_ax
+    if _bar_ax is None:
+        _bar_fig, _bar_ax = _get_plt().subplots(figsize=(12, 6))
+    else:
+        _bar_ax.clear()
+    return _bar_ax
+
+
+def _draw_bar(ax, tests, values, ylabel, title, color, fmt):
+    """Draw a single-series Nmap bar chart with value labels"""
+
+    x = np.arange(len(tests))
+    width = 0.35
+
+    bars = ax.bar(x, values, width, label='Nmap', color=color)
+
+    ax.set_ylabel(ylabel, fontsize=12)
+    ax.set_xlabel('Тест', fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(tests)
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+
+    # Add value labels on bars (empty label for zero-height bars)
+    ax.bar_label(bars, labels=[fmt.format(v) if v > 0 else '' for v in values], fontsize=10)
+
+
+def _render_bar_chart(results_dir, dpi, name, values):
+    """Render a BAR_CHARTS entry into results_dir and return its path"""
+    tests, ylabel, title, color, fmt, ylim = BAR_CHARTS[name]
+
+    ax = _bar_axes()
+    _draw_bar(ax, tests, values, ylabel, title, color, fmt)
+    if ylim:
+        ax.set_ylim(*ylim)
+
+    path = f'{results_dir}/{name}'
+    _bar_fig.tight_layout()
+    _bar_fig.savefig(path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
+    return path
+
+
+def _file_digest(path):
+    """blake2b hex digest of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()
+
+
+def _stamp_matches(path, key):
+    """Check path's sidecar stamp against key and the file's current contents"""
+    try:
+        with open(f'{path}.key', 'r') as f:
+            stamp_key, _, digest = f.read().partition('\n')
+        return stamp_key == key and digest == _file_digest(path)
+    except FileNotFoundError:
+        return False
+
+
+def _write_stamp(path, key):
+    """Record key and a digest of path's contents in its sidecar stamp"""
+    with open(f'{path}.key', 'w') as f:
+        f.write(f'{key}\n{_file_digest(path)}')
+
+
+def _render_architecture_diagram(path, dpi, stamp_key):
+    """Render the system architecture diagram to path, stamp it with stamp_key and return it"""
+
+    plt = _get_plt()
+    fig, ax = plt.subplots(figsize=(14, 10))
+    ax.axis('off')
+
+    # Define positions
+    positions = {
+        'user': (0.5, 0.9),
+        'main_agent': (0.5, 0.7),
+        'nats': (0.5, 0.5),
+        'scanner': (0.2, 0.3),
+        'analyzer': (0.5, 0.3),
+        'reporter': (0.8, 0.3),
+        'postgres': (0.8, 0.1)
+    }
+
+    # Draw boxes
+    boxes = {
+        'user': plt.Rectangle((0.4, 0.87), 0.2, 0.08, fc='#3498db', ec='black', linewidth=2),
+        'main_agent': plt.Rectangle((0.35, 0.67), 0.3, 0.08, fc='#e74c3c', ec='black', linewidth=2),
+        'nats': plt.Rectangle((0.35, 0.47), 0.3, 0.08, fc='#f39c12', ec='black', linewidth=2),
+        'scanner': plt.Rectangle((0.05, 0.27), 0.3, 0.08, fc='#2ecc71', ec='black', linewidth=2),
+        'analyzer': plt.Rectangle((0.35, 0.27), 0.3, 0.08, fc='#2ecc71', ec='black', linewidth=2),
+        'reporter': plt.Rectangle((0.65, 0.27), 0.3, 0.08, fc='#2ecc71', ec='black', linewidth=2),
+        'postgres': plt.Rectangle((0.65, 0.07), 0.3, 0.08, fc='#9b59b6', ec='black', linewidth=2)
+    }
+
+    for box in boxes.values():
+        ax.add_patch(box)
+
+    # Add labels
+    labels = {
+        'user': 'User / CLI / API Client',
+        'main_agent': 'Main Agent\n(REST API :8080)',
+        'nats': 'NATS Message Broker\n(Message Queue)',
+        'scanner': 'Scanner Agent\n(Port Scanning)',
+        'analyzer': 'Analyzer Agent\n(Service Detection)',
+        'reporter': 'Reporter Agent\n(Report Generation)',
+        'postgres': 'PostgreSQL Database\n(Results Storage)'
+    }
+
+    for key, (x, y) in positions.items():
+        ax.text(x, y, labels[key], ha='center', va='center',
+               fontsize=10, fontweight='bold', color='white')
+
+    # Draw arrows
+    arrows = [
+        ((0.5, 0.87), (0.5, 0.75), 'HTTP REST'),
+        ((0.5, 0.67), (0.5, 0.55), 'NATS Pub/Sub'),
+        ((0.45, 0.47), (0.25, 0.35), ''),
+        ((0.5, 0.47), (0.5, 0.35), ''),
+        ((0.55, 0.47), (0.75, 0.35), ''),
+        ((0.8, 0.27), (0.8, 0.15), 'SQL')
+    ]
+
+    for (x1, y1), (x2, y2), label in arrows:
+        ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
+                   arrowprops=dict(arrowstyle='->', lw=2, color='black'))
+        if label:
+            mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
+            ax.text(mid_x + 0.05, mid_y, label, fontsize=9, style='italic')
+
+    # Add title
+    ax.text(0.5, 0.98, 'Pentool Multi-Agent Architecture',
+           ha='center', fontsize=16, fontweight='bold')
+
+    # Add features list
+    features = [
+        '• Go Concurrency (Goroutines)',
+        '• Message-Driven Communication',
+        '• Distributed Microservices',
+        '• Horizontal Scalability',
+        '• Async Processing'
+    ]
+
+    feature_text = '\n'.join(features)
+    ax.text(0.02, 0.5, feature_text, fontsize=9,
+           verticalalignment='top', bbox=dict(boxstyle='round',
+           facecolor='wheat', alpha=0.3))
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_PIL_KWARGS)
+    plt.close(fig)
+    _write_stamp(path, stamp_key)
+    return path
+
 
 class BenchmarkAnalyzer:
-    def __init__(self, results_dir='benchmark_results'):
+    def __init__(self, results_dir='benchmark_results', dpi=DRAFT_DPI, force=False):
         self.results_dir = results_dir
+        self.dpi = dpi
+        self.force = force
         self.data = {
             'pentool': {},
             'nmap': {},
@@ -24,39 +251,29 @@ class BenchmarkAnalyzer:
         }
 
     def parse_time_to_seconds(self, time_str):
-        """Convert time string (MM:SS.ms or S.ms) to seconds"""
-        if ':' in time_str:
-            parts = time_str.split(':')
-            if len(parts) == 2:
-                minutes, seconds = parts
-                return float(minutes) * 60 + float(seconds)
-            elif len(parts) == 3:
-                hours, minutes, seconds = parts
-                return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
-        else:
-            return float(time_str)
+        """Convert time string (H:MM:SS.ms, MM:SS.ms or S.ms) to seconds"""
+        return _time_to_seconds(time_str)
 
     def parse_nmap_metrics(self, filename):
         """Parse /usr/bin/time output for Nmap"""
         metrics = {}
         try:
+            # Single pass over the lines, stopping once every field is read
             with open(filename, 'r') as f:
-                content = f.read()
-
-            # Extract elapsed time
-            elapsed_match = re.search(r'Elapsed \(wall clock\) time.*: (.+)', content)
-            if elapsed_match:
-                metrics['time'] = self.parse_time_to_seconds(elapsed_match.group(1))
-
-            # Extract memory
-            mem_match = re.search(r'Maximum resident set size \(kbytes\): (\d+)', content)
-            if mem_match:
-                metrics['memory_kb'] = int(mem_match.group(1))
-
-            # Extract CPU usage
-            cpu_match = re.search(r'Percent of CPU this job got: (\d+)%', content)
-            if cpu_match:
-                metrics['cpu_percent'] = int(cpu_match.group(1))
+                for line in f:
+                    for label, (key, parse) in _TIME_FIELDS.items():
+                        if label in line:
+                            # Labels may contain ':' themselves, the value follows the last ': '
+                            _, sep, value = line.rpartition(': ')
+                            if sep:
+                                try:
+                                    metrics[key] = parse(value.strip())
+                                except ValueError:
+                                    pass
+                            break
+
+                    if len(metrics) == len(_TIME_FIELDS):
+                        break
 
         except FileNotFoundError:
             print(f"Warning: {filename} not found")
@@ -76,259 +293,113 @@ class BenchmarkAnalyzer:
         self.data['nmap']['service_detection'] = self.parse_nmap_metrics(
             f'{self.results_dir}/nmap_service_metrics.txt')
 
-        # Load Pentool results (from JSON response if available)
+        # Load Pentool results (from JSON response if available);
+        # None marks them as missing so callers can skip Pentool output.
+        # ValueError covers both parsers' decode errors and invalid UTF-8
         try:
-            with open(f'{self.results_dir}/pentool_common_response.json', 'r') as f:
-                pentool_data = json.load(f)
-                # Store basic info
-                self.data['pentool']['scan_id'] = pentool_data.get('scan_id', 'N/A')
-        except:
-            pass
+            with open(f'{self.results_dir}/pentool_common_response.json', 'rb') as f:
+                pentool_data = _loads(f.read())
+        except (FileNotFoundError, ValueError):
+            pentool_data = None
+
+        # Store basic info; a body that is not a JSON object counts as missing
+        if isinstance(pentool_data, dict):
+            self.data['pentool'] = {'scan_id': pentool_data.get('scan_id', 'N/A')}
+        else:
+            self.data['pentool'] = None
+
+    def _materialize_metrics(self):
+        """Collect Nmap metrics into one array: rows are tests, columns are time (s), memory (MB), CPU (%)"""
+        nmap = self.data['nmap']
+        self._nmap_arr = np.array([
+            [d.get('time', 0), d.get('memory_kb', 0) / 1024, d.get('cpu_percent', 0)]
+            for d in (nmap.get(key, {}) for key in NMAP_TESTS)
+        ], dtype=float)
 
     def create_comparison_table(self):
         """Generate comparison table in markdown format"""
 
-        table = "# Сравнительная таблица результатов\n\n"
-        table += "## Тест 1: Сканирование распространенных портов (15 портов)\n\n"
-        table += "| Инструмент | Время выполнения | Память (KB) | Загрузка CPU (%) |\n"
-        table += "|------------|------------------|-------------|------------------|\n"
-
-        nmap_common = self.data['nmap'].get('common_ports', {})
-        table += f"| Nmap | {nmap_common.get('time', 'N/A')}s | "
-        table += f"{nmap_common.get('memory_kb', 'N/A')} | "
-        table += f"{nmap_common.get('cpu_percent', 'N/A')} |\n\n"
-
-        table += "## Тест 2: Сканирование диапазона портов (1-1000)\n\n"
-        table += "| Инструмент | Время выполнения | Память (KB) | Загрузка CPU (%) |\n"
-        table += "|------------|------------------|-------------|------------------|\n"
-
-        nmap_range = self.data['nmap'].get('port_range', {})
-        table += f"| Nmap | {nmap_range.get('time', 'N/A')}s | "
-        table += f"{nmap_range.get('memory_kb', 'N/A')} | "
-        table += f"{nmap_range.get('cpu_percent', 'N/A')} |\n\n"
-
-        table += "## Тест 3: Сканирование localhost (1-1000)\n\n"
-        table += "| Инструмент | Время выполнения | Память (KB) | Загрузка CPU (%) |\n"
-        table += "|------------|------------------|-------------|------------------|\n"
-
-        nmap_localhost = self.data['nmap'].get('localhost', {})
-        table += f"| Nmap | {nmap_localhost.get('time', 'N/A')}s | "
-        table += f"{nmap_localhost.get('memory_kb', 'N/A')} | "
-        table += f"{nmap_localhost.get('cpu_percent', 'N/A')} |\n\n"
-
-        table += "## Тест 4: Определение сервисов\n\n"
-        table += "| Инструмент | Время выполнения | Память (KB) | Загрузка CPU (%) |\n"
-        table += "|------------|------------------|-------------|------------------|\n"
+        sections = [
+            ('Тест 1: Сканирование распространенных портов (15 портов)', 'Nmap', 'common_ports'),
+            ('Тест 2: Сканирование диапазона портов (1-1000)', 'Nmap', 'port_range'),
+            ('Тест 3: Сканирование localhost (1-1000)', 'Nmap', 'localhost'),
+            ('Тест 4: Определение сервисов', 'Nmap -sV', 'service_detection'),
+        ]
 
-        nmap_service = self.data['nmap'].get('service_detection', {})
-        table += f"| Nmap -sV | {nmap_service.get('time', 'N/A')}s | "
-        table += f"{nmap_service.get('memory_kb', 'N/A')} | "
-        table += f"{nmap_service.get('cpu_percent', 'N/A')} |\n\n"
+        nmap = self.data['nmap']
+        parts = ["# Сравнительная таблица результатов\n\n"]
+        for title, tool, key in sections:
+            metrics = nmap.get(key, {})
+            parts.append(
+                f"## {title}\n\n"
+                "| Инструмент | Время выполнения | Память (KB) | Загрузка CPU (%) |\n"
+                "|------------|------------------|-------------|------------------|\n"
+                f"| {tool} | {metrics.get('time', 'N/A')}s | "
+                f"{metrics.get('memory_kb', 'N/A')} | "
+                f"{metrics.get('cpu_percent', 'N/A')} |\n\n"
+            )
+
+        return "".join(parts)
+
+    def _has_data(self, values, name):
+        """Return False (and report the skip) when every value is zero/missing"""
+        if np.any(values):
+            return True
+        print(f"⚠ Skipped: {self.results_dir}/{name} (no data)")
+        return False
+
+    def _bar_chart_job(self, name, values):
+        """Return a render job for a BAR_CHARTS entry, or None when it has no data"""
+        if not self._has_data(values, name):
+            return None
+        return _render_bar_chart, (self.results_dir, self.dpi, name, values)
+
+    def _architecture_job(self):
+        """Return a render job for the architecture diagram, or None when it is up to date"""
+        out = f'{self.results_dir}/architecture_diagram.png'
+
+        # The diagram is static: it only goes stale when this script or the dpi
+        # changes, or when another writer (generate_paper_data.py uses the same
+        # path) replaces the PNG, which the content digest in the stamp catches
+        stamp_key = f'analyze_results-{_file_digest(__file__)}-{self.dpi}'
+        if not self.force and _stamp_matches(out, stamp_key):
+            print(f"✓ Up to date: {out}")
+            return None
+        return _render_architecture_diagram, (out, self.dpi, stamp_key)
+
+    def _render_jobs(self, jobs):
+        """Run (func, args) render jobs, in worker processes when there are several CPUs"""
+        jobs = [job for job in jobs if job is not None]
+
+        # Agg is not thread-safe, so parallelism comes from separate processes
+        if len(jobs) > 1 and (os.cpu_count() or 1) >= 2:
+            with ProcessPoolExecutor(max_workers=min(4, len(jobs))) as executor:
+                futures = [executor.submit(func, *args) for func, args in jobs]
+                paths = [future.result() for future in futures]
+        else:
+            paths = [func(*args) for func, args in jobs]
 
-        return table
+        for path in paths:
+            print(f"✓ Saved: {path}")
 
-    def create_time_comparison_chart(self):
+    def create_time_comparison_chart(self, nmap_times):
         """Create execution time comparison chart"""
+        self._render_jobs([self._bar_chart_job('time_comparison.png', nmap_times)])
 
-        tests = ['Common\nPorts\n(15)', 'Port Range\n(1-1000)', 'Localhost\n(1-1000)', 'Service\nDetection']
-
-        nmap_times = [
-            self.data['nmap'].get('common_ports', {}).get('time', 0),
-            self.data['nmap'].get('port_range', {}).get('time', 0),
-            self.data['nmap'].get('localhost', {}).get('time', 0),
-            self.data['nmap'].get('service_detection', {}).get('time', 0)
-        ]
-
-        x = np.arange(len(tests))
-        width = 0.35
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        bars = ax.bar(x, nmap_times, width, label='Nmap', color='#2E86AB')
-
-        ax.set_ylabel('Время выполнения (секунды)', fontsize=12)
-        ax.set_xlabel('Тест', fontsize=12)
-        ax.set_title('Сравнение времени выполнения сканирования', fontsize=14, fontweight='bold')
-        ax.set_xticks(x)
-        ax.set_xticklabels(tests)
-        ax.legend()
-        ax.grid(axis='y', alpha=0.3)
-
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{height:.2f}s',
-                       ha='center', va='bottom', fontsize=10)
-
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/time_comparison.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/time_comparison.png")
-
-    def create_memory_comparison_chart(self):
+    def create_memory_comparison_chart(self, nmap_memory):
         """Create memory usage comparison chart"""
+        self._render_jobs([self._bar_chart_job('memory_comparison.png', nmap_memory)])
 
-        tests = ['Common\nPorts', 'Port Range', 'Localhost', 'Service\nDetection']
-
-        nmap_memory = [
-            self.data['nmap'].get('common_ports', {}).get('memory_kb', 0) / 1024,  # Convert to MB
-            self.data['nmap'].get('port_range', {}).get('memory_kb', 0) / 1024,
-            self.data['nmap'].get('localhost', {}).get('memory_kb', 0) / 1024,
-            self.data['nmap'].get('service_detection', {}).get('memory_kb', 0) / 1024
-        ]
-
-        x = np.arange(len(tests))
-        width = 0.35
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        bars = ax.bar(x, nmap_memory, width, label='Nmap', color='#A23B72')
-
-        ax.set_ylabel('Использование памяти (MB)', fontsize=12)
-        ax.set_xlabel('Тест', fontsize=12)
-        ax.set_title('Сравнение использования памяти', fontsize=14, fontweight='bold')
-        ax.set_xticks(x)
-        ax.set_xticklabels(tests)
-        ax.legend()
-        ax.grid(axis='y', alpha=0.3)
-
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{height:.1f}MB',
-                       ha='center', va='bottom', fontsize=10)
-
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/memory_comparison.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/memory_comparison.png")
-
-    def create_cpu_comparison_chart(self):
+    def create_cpu_comparison_chart(self, nmap_cpu):
         """Create CPU usage comparison chart"""
-
-        tests = ['Common\nPorts', 'Port Range', 'Localhost', 'Service\nDetection']
-
-        nmap_cpu = [
-            self.data['nmap'].get('common_ports', {}).get('cpu_percent', 0),
-            self.data['nmap'].get('port_range', {}).get('cpu_percent', 0),
-            self.data['nmap'].get('localhost', {}).get('cpu_percent', 0),
-            self.data['nmap'].get('service_detection', {}).get('cpu_percent', 0)
-        ]
-
-        x = np.arange(len(tests))
-        width = 0.35
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        bars = ax.bar(x, nmap_cpu, width, label='Nmap', color='#F18F01')
-
-        ax.set_ylabel('Загрузка CPU (%)', fontsize=12)
-        ax.set_xlabel('Тест', fontsize=12)
-        ax.set_title('Сравнение загрузки процессора', fontsize=14, fontweight='bold')
-        ax.set_xticks(x)
-        ax.set_xticklabels(tests)
-        ax.legend()
-        ax.grid(axis='y', alpha=0.3)
-        ax.set_ylim(0, 100)
-
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}%',
-                       ha='center', va='bottom', fontsize=10)
-
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/cpu_comparison.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/cpu_comparison.png")
+        self._render_jobs([self._bar_chart_job('cpu_comparison.png', nmap_cpu)])
 
     def create_architecture_diagram(self):
         """Create system architecture diagram"""
+        self._render_jobs([self._architecture_job()])
 
-        fig, ax = plt.subplots(figsize=(14, 10))
-        ax.axis('off')
-
-        # Define positions
-        positions = {
-            'user': (0.5, 0.9),
-            'main_agent': (0.5, 0.7),
-            'nats': (0.5, 0.5),
-            'scanner': (0.2, 0.3),
-            'analyzer': (0.5, 0.3),
-            'reporter': (0.8, 0.3),
-            'postgres': (0.8, 0.1)
-        }
-
-        # Draw boxes
-        boxes = {
-            'user': plt.Rectangle((0.4, 0.87), 0.2, 0.08, fc='#3498db', ec='black', linewidth=2),
-            'main_agent': plt.Rectangle((0.35, 0.67), 0.3, 0.08, fc='#e74c3c', ec='black', linewidth=2),
-            'nats': plt.Rectangle((0.35, 0.47), 0.3, 0.08, fc='#f39c12', ec='black', linewidth=2),
-            'scanner': plt.Rectangle((0.05, 0.27), 0.3, 0.08, fc='#2ecc71', ec='black', linewidth=2),
-            'analyzer': plt.Rectangle((0.35, 0.27), 0.3, 0.08, fc='#2ecc71', ec='black', linewidth=2),
-            'reporter': plt.Rectangle((0.65, 0.27), 0.3, 0.08, fc='#2ecc71', ec='black', linewidth=2),
-            'postgres': plt.Rectangle((0.65, 0.07), 0.3, 0.08, fc='#9b59b6', ec='black', linewidth=2)
-        }
-
-        for box in boxes.values():
-            ax.add_patch(box)
-
-        # Add labels
-        labels = {
-            'user': 'User / CLI / API Client',
-            'main_agent': 'Main Agent\n(REST API :8080)',
-            'nats': 'NATS Message Broker\n(Message Queue)',
-            'scanner': 'Scanner Agent\n(Port Scanning)',
-            'analyzer': 'Analyzer Agent\n(Service Detection)',
-            'reporter': 'Reporter Agent\n(Report Generation)',
-            'postgres': 'PostgreSQL Database\n(Results Storage)'
-        }
-
-        for key, (x, y) in positions.items():
-            ax.text(x, y, labels[key], ha='center', va='center',
-                   fontsize=10, fontweight='bold', color='white')
-
-        # Draw arrows
-        arrows = [
-            ((0.5, 0.87), (0.5, 0.75), 'HTTP REST'),
-            ((0.5, 0.67), (0.5, 0.55), 'NATS Pub/Sub'),
-            ((0.45, 0.47), (0.25, 0.35), ''),
-            ((0.5, 0.47), (0.5, 0.35), ''),
-            ((0.55, 0.47), (0.75, 0.35), ''),
-            ((0.8, 0.27), (0.8, 0.15), 'SQL')
-        ]
-
-        for (x1, y1), (x2, y2), label in arrows:
-            ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                       arrowprops=dict(arrowstyle='->', lw=2, color='black'))
-            if label:
-                mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-                ax.text(mid_x + 0.05, mid_y, label, fontsize=9, style='italic')
-
-        # Add title
-        ax.text(0.5, 0.98, 'Pentool Multi-Agent Architecture',
-               ha='center', fontsize=16, fontweight='bold')
-
-        # Add features list
-        features = [
-            '• Go Concurrency (Goroutines)',
-            '• Message-Driven Communication',
-            '• Distributed Microservices',
-            '• Horizontal Scalability',
-            '• Async Processing'
-        ]
-
-        feature_text = '\n'.join(features)
-        ax.text(0.02, 0.5, feature_text, fontsize=9,
-               verticalalignment='top', bbox=dict(boxstyle='round',
-               facecolor='wheat', alpha=0.3))
-
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/architecture_diagram.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/architecture_diagram.png")
-
-    def generate_report(self):
-        """Generate complete analysis report"""
+    def generate_report(self, no_charts=False, no_arch=False):
+        """Generate complete analysis report, optionally skipping charts or the diagram"""
 
         print("\n" + "="*60)
         print("  Benchmark Results Analysis")
@@ -337,6 +408,7 @@ class BenchmarkAnalyzer:
         # Load results
         print("Loading benchmark results...")
         self.load_results()
+        self._materialize_metrics()
         print("✓ Results loaded\n")
 
         # Create comparison table
@@ -347,11 +419,22 @@ class BenchmarkAnalyzer:
         print(f"✓ Saved: {self.results_dir}/comparison_table.md\n")
 
         # Create charts
-        print("Generating charts...")
-        self.create_time_comparison_chart()
-        self.create_memory_comparison_chart()
-        self.create_cpu_comparison_chart()
-        self.create_architecture_diagram()
+        if not (no_charts and no_arch):
+            print("Generating charts...")
+        # The renders are independent, so they are dispatched together
+        # Chart jobs by file name; None marks a chart skipped for lack of data
+        chart_jobs = {}
+        if not no_charts:
+            chart_jobs['time_comparison.png'] = self._bar_chart_job(
+                'time_comparison.png', self._nmap_arr[:, 0])
+            chart_jobs['memory_comparison.png'] = self._bar_chart_job(
+                'memory_comparison.png', self._nmap_arr[:, 1])
+            chart_jobs['cpu_comparison.png'] = self._bar_chart_job(
+                'cpu_comparison.png', self._nmap_arr[:, 2])
+        jobs = list(chart_jobs.values())
+        if not no_arch:
+            jobs.append(self._architecture_job())
+        self._render_jobs(jobs)
 
         print("\n" + "="*60)
         print("  Analysis Complete!")
@@ -359,12 +442,31 @@ class BenchmarkAnalyzer:
         print(f"\nAll results saved in: {self.results_dir}/")
         print("\nGenerated files:")
         print("  • comparison_table.md - Detailed comparison table")
-        print("  • time_comparison.png - Execution time chart")
-        print("  • memory_comparison.png - Memory usage chart")
-        print("  • cpu_comparison.png - CPU usage chart")
-        print("  • architecture_diagram.png - System architecture")
+        if chart_jobs.get('time_comparison.png'):
+            print("  • time_comparison.png - Execution time chart")
+        if chart_jobs.get('memory_comparison.png'):
+            print("  • memory_comparison.png - Memory usage chart")
+        if chart_jobs.get('cpu_comparison.png'):
+            print("  • cpu_comparison.png - CPU usage chart")
+        if not no_arch:
+            print("  • architecture_diagram.png - System architecture")
 
 
 if __name__ == '__main__':
-    analyzer = BenchmarkAnalyzer()
-    analyzer.generate_report()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Generate benchmark charts and comparison tables')
+    parser.add_argument('--results-dir', default='benchmark_results',
+                        help='directory with benchmark results (default: benchmark_results)')
+    parser.add_argument('--no-charts', action='store_true',
+                        help='skip the time/memory/CPU charts')
+    parser.add_argument('--no-arch', action='store_true',
+                        help='skip the architecture diagram')
+    parser.add_argument('--publication', action='store_true',
+                        help=f'render charts at {PUBLICATION_DPI} dpi instead of {DRAFT_DPI}')
+    parser.add_argument('--force', action='store_true',
+                        help='re-render the architecture diagram even if it is up to date')
+    args = parser.parse_args()
+
+    analyzer = BenchmarkAnalyzer(results_dir=args.results_dir,
+                                 dpi=PUBLICATION_DPI if args.publication else DRAFT_DPI,
+                                 force=args.force)
+    analyzer.generate_report(no_charts=args.no_charts, no_arch=args.no_arch)
\ No newline at end of file
@@ -4,160 +4,538 @@ Research Paper Data Generator
 Creates comprehensive analysis with charts, tables, and diagrams for scientific paper
 """
 
+import argparse
+import hashlib
 import json
 import re
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-import numpy as np
+from matplotlib import font_manager
+from matplotlib.collections import PatchCollection
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import os
+import shutil
+import subprocess
 import sys
+import types
+
+# orjson is optional; fall back to the stdlib parser when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 # Set matplotlib to use non-interactive backend
 plt.switch_backend('Agg')
 
-# Set Russian font support
-plt.rcParams['font.family'] = 'DejaVu Sans'
+# Set Russian font support; all settings go in one validated update
+plt.rcParams.update({
+    'font.family': 'DejaVu Sans',
+    'agg.path.chunksize': 10000,
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+})
+
+# Resolve the font once at import so the first savefig does not pay for the lookup
+font_manager.findfont('DejaVu Sans')
+
+# Time, memory and CPU lines of /usr/bin/time output, matched in one pass
+_TIME_RE = re.compile(r'Time: (?P<time>.+)|Memory: (?P<mem>\d+) KB|CPU: (?P<cpu>\d+)%')
+
+# /usr/bin/time outputs for the Nmap tests, in chart order
+NMAP_TIME_FILES = ('nmap_common_time.txt', 'nmap_range_time.txt', 'nmap_service_time.txt')
+
+# Static markdown blocks of the research report
+PERFORMANCE_TABLE_HEADER_MD = """## 1. Сравнительная таблица производительности
+
+| Инструмент | Тест | Время (мс) | Время (с) | Найдено портов | Память (MB) | CPU (%) |
+|------------|------|------------|-----------|----------------|-------------|----------|
+"""
+
+CONCLUSIONS_MD = """## 3. Выводы
+
+### Преимущества Pentool:
+- ✓ Мульти-агентная распределенная архитектура
+- ✓ Асинхронная обработка через NATS
+- ✓ Горизонтальная масштабируемость
+- ✓ Современные паттерны Go (goroutines, channels)
+- ✓ RESTful API для интеграции
+- ✓ PostgreSQL для хранения результатов
+
+### Области для оптимизации:
+- ⚠ Скорость сканирования (timeout оптимизация)
+- ⚠ Параллелизм (увеличение maxWorkers)
+- ⚠ Точность обнаружения портов
+
+"""
+
+# Research report body, filled in with str.format_map; the table header and
+# conclusions are spliced in as-is, so they must stay free of braces
+RESEARCH_REPORT_MD = (
+    "# Результаты тестирования Pentool\n\n"
+    "**Дата тестирования:** {timestamp}  \n"
+    "**Цель тестирования:** {target}  \n\n"
+    + PERFORMANCE_TABLE_HEADER_MD +
+    """| **Pentool** | Общие порты (15) | {pentool[time_ms]} | {pentool_time:.2f} | {pentool[open_ports]} | - | - |
+| **Nmap** | Общие порты (15) | {nmap_common[time_ms]} | {nmap_time:.2f} | {nmap_common[open_ports]} | {nmap_common_mb:.1f} | {nmap_common_cpu} |
+| **Nmap** | Диапазон 1-100 | {nmap_range[time_ms]} | {nmap_range_time:.2f} | {nmap_range[open_ports]} | {nmap_range_mb:.1f} | {nmap_range_cpu} |
+| **Nmap -sV** | Определение сервисов | {nmap_service[time_ms]} | {nmap_service_time:.2f} | - | {nmap_service_mb:.1f} | {nmap_service_cpu} |
+
+## 2. Анализ результатов
+
+### 2.1 Скорость сканирования
+
+{speed_summary}### 2.2 Использование ресурсов
+
+**Память:**
+- Nmap (общие порты): {nmap_common_mb:.1f} MB
+- Nmap (диапазон): {nmap_range_mb:.1f} MB
+- Nmap (определение сервисов): {nmap_service_mb:.1f} MB
+
+**Загрузка CPU:**
+- Nmap (общие порты): {nmap_common_cpu}%
+- Nmap (диапазон): {nmap_range_cpu}%
+- Nmap (определение сервисов): {nmap_service_cpu}%
+
+### 2.3 Точность обнаружения
+
+- Pentool нашел: {pentool_ports} открытых портов
+- Nmap нашел: {nmap_ports} открытых портов
+
+"""
+    + CONCLUSIONS_MD
+)
+
+# Speed comparison of section 2.1, only written when Nmap has a time
+SPEED_SUMMARY_MD = """- **Pentool**: {pentool_time:.2f} секунд
+- **Nmap**: {nmap_time:.2f} секунд
+- **Соотношение**: Pentool медленнее в {ratio:.1f}x раз
+
+"""
+
+FEATURE_COMPARISON_MD = """
+## 4. Сравнение функциональности
+
+| Функция | Pentool | Nmap | Masscan |
+|---------|---------|------|----------|
+| Сканирование портов | ✓ | ✓ | ✓ |
+| Определение сервисов | ✓ | ✓ | ✗ |
+| REST API | ✓ | ✗ | ✗ |
+| Распределенная архитектура | ✓ | ✗ | ✗ |
+| Горизонтальное масштабирование | ✓ | ✗ | ✗ |
+| Асинхронная обработка | ✓ | ✗ | ✓ |
+| Хранение результатов в БД | ✓ | ✗ | ✗ |
+| Сверхбыстрое сканирование | ✗ | ✗ | ✓ |
+| OS Detection | ✗ | ✓ | ✗ |
+| NSE Scripts | ✗ | ✓ | ✗ |
+
+"""
+
+def _code_fingerprint(code):
+    """Hash a code object's bytecode, names and constants (recursing into nested code)"""
+    h = hashlib.blake2b(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            h.update(_code_fingerprint(const).encode())
+        else:
+            h.update(repr(const).encode())
+    return h.hexdigest()
+
+
+def _file_digest(path):
+    """blake2b hex digest of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read()).hexdigest()
+
+
+def _stamp_matches(path, key):
+    """Check path's sidecar stamp against key and the file's current contents"""
+    try:
+        with open(f'{path}.key', 'r') as f:
+            stamp_key, _, digest = f.read().partition('\n')
+        return stamp_key == key and digest == _file_digest(path)
+    except FileNotFoundError:
+        return False
+
+
+def _write_stamp(path, key):
+    """Record key and a digest of path's contents in its sidecar stamp"""
+    with open(f'{path}.key', 'w') as f:
+        f.write(f'{key}\n{_file_digest(path)}')
+
+
+# One Figure per process, reused by every chart and cleared and resized per chart
+_fig = None
+
+
+def _new_axes(width, height):
+    """Clear the shared Figure, resize it and return a fresh Axes"""
+    global _fig
+    if _fig is None:
+        _fig = plt.figure()
+    _fig.clear()
+    _fig.set_size_inches(width, height)
+    return _fig.add_subplot(111)
+
+
+def _close_figure():
+    """Release the shared Figure"""
+    global _fig
+    if _fig is not None:
+        plt.close(_fig)
+        _fig = None
+
+
+def _render_time_chart(results_dir, dpi, pentool_times, nmap_times):
+    """Render the execution time chart; returns the saved paths"""
+
+    labels = ['Общие\nпорты\n(15)', 'Диапазон\n1-100', 'Определение\nсервисов']
+
+    x = list(range(len(labels)))
+    width = 0.35
+
+    ax = _new_axes(12, 7)
+
+    bars1 = ax.bar([xi - width/2 for xi in x], pentool_times, width, label='Pentool', color='#3498db', alpha=0.8)
+    bars2 = ax.bar([xi + width/2 for xi in x], nmap_times, width, label='Nmap', color='#e74c3c', alpha=0.8)
+
+    ax.set_ylabel('Время выполнения (секунды)', fontsize=13, fontweight='bold')
+    ax.set_xlabel('Тип теста', fontsize=13, fontweight='bold')
+    ax.set_title('Сравнение времени выполнения сканирования\nPentool vs Nmap',
+                 fontsize=15, fontweight='bold', pad=20)
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, fontsize=11)
+    ax.legend(fontsize=12)
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+    # Add value labels (empty label for zero-height bars)
+    for bars, times in [(bars1, pentool_times), (bars2, nmap_times)]:
+        ax.bar_label(bars, labels=[f'{t:.2f}s' if t > 0 else '' for t in times],
+                     fontsize=10, fontweight='bold')
+
+    path = f'{results_dir}/time_comparison.png'
+    _fig.tight_layout()
+    _fig.savefig(path, dpi=dpi)
+    return [path]
+
+
+def _render_memory_chart(results_dir, dpi, memory):
+    """Render the Nmap memory usage chart; returns the saved paths"""
+
+    labels = ['Общие\nпорты', 'Диапазон\n1-100', 'Определение\nсервисов']
+
+    ax = _new_axes(10, 6)
+    bars = ax.bar(labels, memory, color=['#e74c3c', '#e67e22', '#d35400'], alpha=0.8)
+
+    ax.set_ylabel('Использование памяти (MB)', fontsize=12, fontweight='bold')
+    ax.set_xlabel('Тип теста', fontsize=12, fontweight='bold')
+    ax.set_title('Использование памяти - Nmap', fontsize=14, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+
+    # Add value labels (empty label for zero-height bars)
+    ax.bar_label(bars, labels=[f'{m:.1f} MB' if m > 0 else '' for m in memory],
+                 fontsize=11, fontweight='bold')
+
+    path = f'{results_dir}/memory_comparison.png'
+    _fig.tight_layout()
+    _fig.savefig(path, dpi=dpi)
+    return [path]
+
+
+def _render_architecture_diagram(results_dir, dpi, key):
+    """Render the architecture diagram as SVG and PNG and record its cache key"""
+
+    ax = _new_axes(16, 12)
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 10)
+    ax.axis('off')
+
+    # Title
+    ax.text(5, 9.5, 'Pentool: Мульти-Агентная Архитектура',
+           ha='center', fontsize=18, fontweight='bold',
+           bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
+
+    # Boxes: (x, y, width, height, color, label, label y offset, label size,
+    #         sublabel, sublabel size); sublabels sit 0.2 above the box bottom
+    nodes = [
+        (4, 8, 2, 0.6, '#3498db', 'User / Client', 0.3, 12, None, None),
+        (3.5, 6.5, 3, 0.8, '#e74c3c', 'Main Agent', 0.4, 13, '(REST API :8080)', 9),
+        (3.5, 5, 3, 0.8, '#f39c12', 'NATS Message Broker', 0.5, 13, '(Pub/Sub :4222)', 9),
+        # Worker Agents
+        (1.5, 3.5, 2, 0.8, '#2ecc71', 'Scanner Agent', 0.5, 11, 'Сканирование\nпортов', 8),
+        (4, 3.5, 2, 0.8, '#2ecc71', 'Analyzer Agent', 0.5, 11, 'Определение\nсервисов', 8),
+        (6.5, 3.5, 2, 0.8, '#2ecc71', 'Reporter Agent', 0.5, 11, 'Генерация\nотчетов', 8),
+        # Database
+        (6.5, 1.5, 2, 0.8, '#9b59b6', 'PostgreSQL', 0.5, 12, 'Database', 9),
+    ]
+
+    boxes = []
+    for x_pos, y_pos, width, height, color, label, label_dy, label_size, sublabel, sublabel_size in nodes:
+        boxes.append(mpatches.FancyBboxPatch((x_pos, y_pos), width, height,
+                                             boxstyle="round,pad=0.1",
+                                             edgecolor='black', facecolor=color, linewidth=2))
+        ax.text(x_pos + width / 2, y_pos + label_dy, label, ha='center', va='center',
+               fontsize=label_size, fontweight='bold', color='white')
+        if sublabel:
+            ax.text(x_pos + width / 2, y_pos + 0.2, sublabel, ha='center', va='center',
+                   fontsize=sublabel_size, color='white')
+
+    # All boxes go in as a single artist
+    ax.add_collection(PatchCollection(boxes, match_original=True))
+
+    # Arrows
+    arrows = [
+        ((5, 8), (5, 7.3), 'HTTP\nREST API', 'black'),
+        ((5, 6.5), (5, 5.8), 'NATS\nPublish', 'black'),
+        ((4.5, 5), (2.5, 4.3), 'scan.request', '#555'),
+        ((5, 5), (5, 4.3), 'scan.result', '#555'),
+        ((5.5, 5), (7.5, 4.3), 'service.info', '#555'),
+        ((7.5, 3.5), (7.5, 2.3), 'SQL\nINSERT', 'black'),
+    ]
+
+    for (x1, y1), (x2, y2), label, color in arrows:
+        ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
+                   arrowprops=dict(arrowstyle='->', lw=2.5, color=color))
+        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
+        ax.text(mid_x + 0.3, mid_y, label, fontsize=8,
+               style='italic', color=color, fontweight='bold')
+
+    # Features box
+    features_text = (
+        "Ключевые особенности:\n\n"
+        "✓ Go Concurrency (Goroutines)\n"
+        "✓ Async Message Passing\n"
+        "✓ Distributed Architecture\n"
+        "✓ Horizontal Scalability\n"
+        "✓ Microservices Pattern\n"
+        "✓ Event-Driven Design"
+    )
+
+    ax.text(0.3, 5, features_text, fontsize=9,
+           verticalalignment='top',
+           bbox=dict(boxstyle='round', facecolor='#ecf0f1',
+                    alpha=0.9, edgecolor='black', linewidth=1.5))
+
+    # Tech stack box
+    tech_text = (
+        "Технологии:\n\n"
+        "• Go 1.19+\n"
+        "• NATS Streaming\n"
+        "• PostgreSQL 15\n"
+        "• Docker\n"
+        "• REST API"
+    )
+
+    ax.text(9.7, 5, tech_text, fontsize=9,
+           verticalalignment='top', ha='right',
+           bbox=dict(boxstyle='round', facecolor='#ecf0f1',
+                    alpha=0.9, edgecolor='black', linewidth=1.5))
+
+    png = f'{results_dir}/architecture_diagram.png'
+    svg = f'{results_dir}/architecture_diagram.svg'
+
+    _fig.tight_layout()
+    # The diagram is pure vector shapes, so SVG is the lossless copy for the paper
+    _fig.savefig(svg, bbox_inches='tight')
+    _fig.savefig(png, dpi=dpi, bbox_inches='tight')
+
+    _write_stamp(png, key)
+    return [svg, png]
+
+
+# Architecture diagram as a Graphviz DOT graph; dot does the layout and
+# rendering in C, which is far cheaper than placing matplotlib patches by hand
+ARCHITECTURE_DOT = """digraph Pentool {
+    graph [label="Pentool: Мульти-Агентная Архитектура", labelloc=t, fontsize=18,
+           fontname="DejaVu Sans Bold", nodesep=0.5, ranksep=0.6];
+    node [shape=box, style="rounded,filled", fontname="DejaVu Sans",
+          fontcolor=white, penwidth=2];
+    edge [fontname="DejaVu Sans Oblique", fontsize=8, penwidth=2.5, arrowhead=vee];
+
+    user [label=<<b>User / Client</b>>, fillcolor="#3498db"];
+    main [label=<<b>Main Agent</b><br/><font point-size="9">(REST API :8080)</font>>,
+          fillcolor="#e74c3c"];
+    nats [label=<<b>NATS Message Broker</b><br/><font point-size="9">(Pub/Sub :4222)</font>>,
+          fillcolor="#f39c12"];
+
+    // Worker Agents
+    scanner [label=<<b>Scanner Agent</b><br/><font point-size="8">Сканирование<br/>портов</font>>,
+             fillcolor="#2ecc71"];
+    analyzer [label=<<b>Analyzer Agent</b><br/><font point-size="8">Определение<br/>сервисов</font>>,
+              fillcolor="#2ecc71"];
+    reporter [label=<<b>Reporter Agent</b><br/><font point-size="8">Генерация<br/>отчетов</font>>,
+              fillcolor="#2ecc71"];
+    {rank=same; scanner; analyzer; reporter}
+
+    // Database
+    postgres [label=<<b>PostgreSQL</b><br/><font point-size="9">Database</font>>,
+              fillcolor="#9b59b6"];
+
+    user -> main [label="HTTP\\nREST API"];
+    main -> nats [label="NATS\\nPublish"];
+    nats -> scanner [label="scan.request", color="#555555", fontcolor="#555555"];
+    nats -> analyzer [label="scan.result", color="#555555", fontcolor="#555555"];
+    nats -> reporter [label="service.info", color="#555555", fontcolor="#555555"];
+    reporter -> postgres [label="SQL\\nINSERT"];
+
+    node [shape=note, style=filled, fillcolor="#ecf0f1", fontcolor=black,
+          fontsize=9, penwidth=1.5];
+    features [label="Ключевые особенности:\\l\\l✓ Go Concurrency (Goroutines)\\l✓ Async Message Passing\\l✓ Distributed Architecture\\l✓ Horizontal Scalability\\l✓ Microservices Pattern\\l✓ Event-Driven Design\\l"];
+    tech [label="Технологии:\\l\\l• Go 1.19+\\l• NATS Streaming\\l• PostgreSQL 15\\l• Docker\\l• REST API\\l"];
+    {rank=same; features; nats; tech}
+    features -> nats -> tech [style=invis];
+}
+"""
+
+
+def _architecture_key(render, dpi):
+    """Cache key of the architecture diagram drawn by render at dpi"""
+    key = f'generate_paper_data-{_code_fingerprint(render.__code__)}-{dpi}'
+    if render is _render_architecture_dot:
+        key = f'{key}-{hashlib.blake2b(ARCHITECTURE_DOT.encode()).hexdigest()}'
+    return key
+
+
+def _render_architecture_dot(results_dir, dpi, key):
+    """Render the architecture diagram with Graphviz as SVG and PNG and record its cache key"""
+
+    png = f'{results_dir}/architecture_diagram.png'
+    svg = f'{results_dir}/architecture_diagram.svg'
+
+    # One dot run lays the graph out once and writes both formats from it
+    try:
+        subprocess.run(['dot', f'-Gdpi={dpi}', '-Tsvg', '-o', svg, '-Tpng', '-o', png],
+                       input=ARCHITECTURE_DOT, encoding='utf-8', check=True)
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"⚠ Graphviz failed ({e}), drawing the architecture diagram with matplotlib")
+        return _render_architecture_diagram(
+            results_dir, dpi, _architecture_key(_render_architecture_diagram, dpi))
+
+    _write_stamp(png, key)
+    return [svg, png]
+
 
 class ResearchDataGenerator:
-    def __init__(self, results_dir='benchmark_results'):
+    def __init__(self, results_dir='benchmark_results', dpi=150, backend='graphviz'):
         self.results_dir = results_dir
+        # Raster resolution for PNG output; 150 dpi is enough for half-page figures
+        self.dpi = dpi
+        # Architecture diagram renderer: 'graphviz' or 'matplotlib'
+        self.backend = backend
         self.data = {}
+        # Parsed /usr/bin/time metrics by filename
+        self._time_cache = {}
 
         # Create output directory
         os.makedirs(results_dir, exist_ok=True)
 
+        # List the inputs once instead of probing for each file on open
+        self._files = set(os.listdir(results_dir))
+
+    def _has(self, name):
+        """Check whether results_dir contained name when the generator was created"""
+        return name in self._files
+
     def load_summary(self):
         """Load summary.json with benchmark results"""
         try:
-            with open(f'{self.results_dir}/summary.json', 'r') as f:
-                self.data = json.load(f)
+            with open(f'{self.results_dir}/summary.json', 'rb') as f:
+                self.data = _loads(f.read())
             print("✓ Loaded benchmark summary")
-            return True
         except FileNotFoundError:
             print("✗ Error: summary.json not found. Run benchmark first.")
             return False
 
+        # Warm the metrics cache; the reads are independent and I/O-bound
+        with ThreadPoolExecutor(max_workers=len(NMAP_TIME_FILES)) as executor:
+            list(executor.map(self.parse_time_metrics,
+                              [f'{self.results_dir}/{name}' for name in NMAP_TIME_FILES]))
+        return True
+
     def parse_time_metrics(self, filename):
-        """Parse /usr/bin/time output"""
+        """Parse /usr/bin/time output (cached per filename)"""
+        if filename in self._time_cache:
+            return self._time_cache[filename]
+
         metrics = {}
+        if not self._has(os.path.basename(filename)):
+            print(f"Warning: {filename} not found")
+            self._time_cache[filename] = metrics
+            return metrics
+
         try:
             with open(filename, 'r') as f:
                 content = f.read()
 
-            # Extract time
-            time_match = re.search(r'Time: (.+)', content)
-            if time_match:
-                time_str = time_match.group(1)
-                metrics['time_str'] = time_str
-
-            # Extract memory
-            mem_match = re.search(r'Memory: (\d+) KB', content)
-            if mem_match:
-                metrics['memory_kb'] = int(mem_match.group(1))
-
-            # Extract CPU
-            cpu_match = re.search(r'CPU: (\d+)%', content)
-            if cpu_match:
-                metrics['cpu_percent'] = int(cpu_match.group(1))
+            # Single pass over the content; the first match of each field wins
+            for match in _TIME_RE.finditer(content):
+                if match['time'] is not None:
+                    metrics.setdefault('time_str', match['time'])
+                elif match['mem'] is not None:
+                    metrics.setdefault('memory_kb', int(match['mem']))
+                else:
+                    metrics.setdefault('cpu_percent', int(match['cpu']))
 
         except FileNotFoundError:
             print(f"Warning: {filename} not found")
 
+        self._time_cache[filename] = metrics
         return metrics
 
-    def create_comparison_table_md(self):
-        """Generate comprehensive comparison table in markdown"""
+    def write_comparison_table(self, fh):
+        """Write comprehensive comparison table in markdown to fh"""
 
         tests = self.data.get('tests', {})
 
-        table = "# Результаты тестирования Pentool\n\n"
-        table += f"**Дата тестирования:** {self.data.get('timestamp', 'N/A')}  \n"
-        table += f"**Цель тестирования:** {self.data.get('target', 'N/A')}  \n\n"
-
-        table += "## 1. Сравнительная таблица производительности\n\n"
-        table += "| Инструмент | Тест | Время (мс) | Время (с) | Найдено портов | Память (MB) | CPU (%) |\n"
-        table += "|------------|------|------------|-----------|----------------|-------------|----------|\n"
-
-        # Pentool common ports
         pentool = tests.get('pentool_common_ports', {})
-        table += f"| **Pentool** | Общие порты (15) | {pentool.get('time_ms', 'N/A')} | "
-        table += f"{pentool.get('time_ms', 0)/1000:.2f} | {pentool.get('open_ports', 'N/A')} | - | - |\n"
-
-        # Nmap common ports
         nmap_common = tests.get('nmap_common_ports', {})
-        nmap_common_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_common_time.txt')
-        table += f"| **Nmap** | Общие порты (15) | {nmap_common.get('time_ms', 'N/A')} | "
-        table += f"{nmap_common.get('time_ms', 0)/1000:.2f} | {nmap_common.get('open_ports', 'N/A')} | "
-        table += f"{nmap_common_metrics.get('memory_kb', 0)/1024:.1f} | "
-        table += f"{nmap_common_metrics.get('cpu_percent', 'N/A')} |\n"
-
-        # Nmap port range
         nmap_range = tests.get('nmap_port_range_1_100', {})
-        nmap_range_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_range_time.txt')
-        table += f"| **Nmap** | Диапазон 1-100 | {nmap_range.get('time_ms', 'N/A')} | "
-        table += f"{nmap_range.get('time_ms', 0)/1000:.2f} | {nmap_range.get('open_ports', 'N/A')} | "
-        table += f"{nmap_range_metrics.get('memory_kb', 0)/1024:.1f} | "
-        table += f"{nmap_range_metrics.get('cpu_percent', 'N/A')} |\n"
-
-        # Nmap service detection
         nmap_service = tests.get('nmap_service_detection', {})
-        nmap_service_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_service_time.txt')
-        table += f"| **Nmap -sV** | Определение сервисов | {nmap_service.get('time_ms', 'N/A')} | "
-        table += f"{nmap_service.get('time_ms', 0)/1000:.2f} | - | "
-        table += f"{nmap_service_metrics.get('memory_kb', 0)/1024:.1f} | "
-        table += f"{nmap_service_metrics.get('cpu_percent', 'N/A')} |\n"
 
-        table += "\n## 2. Анализ результатов\n\n"
-        table += "### 2.1 Скорость сканирования\n\n"
+        nmap_common_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_common_time.txt')
+        nmap_range_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_range_time.txt')
+        nmap_service_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_service_time.txt')
 
+        # Unit conversions, computed once: ms -> s and KB -> MB
         pentool_time = pentool.get('time_ms', 0) / 1000
         nmap_time = nmap_common.get('time_ms', 0) / 1000
 
+        speed_summary = ''
         if nmap_time > 0:
-            ratio = pentool_time / nmap_time
-            table += f"- **Pentool**: {pentool_time:.2f} секунд\n"
-            table += f"- **Nmap**: {nmap_time:.2f} секунд\n"
-            table += f"- **Соотношение**: Pentool медленнее в {ratio:.1f}x раз\n\n"
-
-        table += "### 2.2 Использование ресурсов\n\n"
-        table += "**Память:**\n"
-        table += f"- Nmap (общие порты): {nmap_common_metrics.get('memory_kb', 0)/1024:.1f} MB\n"
-        table += f"- Nmap (диапазон): {nmap_range_metrics.get('memory_kb', 0)/1024:.1f} MB\n"
-        table += f"- Nmap (определение сервисов): {nmap_service_metrics.get('memory_kb', 0)/1024:.1f} MB\n\n"
-
-        table += "**Загрузка CPU:**\n"
-        table += f"- Nmap (общие порты): {nmap_common_metrics.get('cpu_percent', 'N/A')}%\n"
-        table += f"- Nmap (диапазон): {nmap_range_metrics.get('cpu_percent', 'N/A')}%\n"
-        table += f"- Nmap (определение сервисов): {nmap_service_metrics.get('cpu_percent', 'N/A')}%\n\n"
-
-        table += "### 2.3 Точность обнаружения\n\n"
-        table += f"- Pentool нашел: {pentool.get('open_ports', 0)} открытых портов\n"
-        table += f"- Nmap нашел: {nmap_common.get('open_ports', 0)} открытых портов\n\n"
-
-        table += "## 3. Выводы\n\n"
-        table += "### Преимущества Pentool:\n"
-        table += "- ✓ Мульти-агентная распределенная архитектура\n"
-        table += "- ✓ Асинхронная обработка через NATS\n"
-        table += "- ✓ Горизонтальная масштабируемость\n"
-        table += "- ✓ Современные паттерны Go (goroutines, channels)\n"
-        table += "- ✓ RESTful API для интеграции\n"
-        table += "- ✓ PostgreSQL для хранения результатов\n\n"
-
-        table += "### Области для оптимизации:\n"
-        table += "- ⚠ Скорость сканирования (timeout оптимизация)\n"
-        table += "- ⚠ Параллелизм (увеличение maxWorkers)\n"
-        table += "- ⚠ Точность обнаружения портов\n\n"
-
-        return table
-
-    def create_time_comparison_chart(self):
-        """Create execution time comparison chart"""
+            speed_summary = SPEED_SUMMARY_MD.format(
+                pentool_time=pentool_time, nmap_time=nmap_time, ratio=pentool_time / nmap_time)
+
+        fh.write(RESEARCH_REPORT_MD.format_map({
+            'timestamp': self.data.get('timestamp', 'N/A'),
+            'target': self.data.get('target', 'N/A'),
+            # Missing table cells read as N/A
+            'pentool': {'time_ms': 'N/A', 'open_ports': 'N/A', **pentool},
+            'nmap_common': {'time_ms': 'N/A', 'open_ports': 'N/A', **nmap_common},
+            'nmap_range': {'time_ms': 'N/A', 'open_ports': 'N/A', **nmap_range},
+            'nmap_service': {'time_ms': 'N/A', **nmap_service},
+            'pentool_time': pentool_time,
+            'nmap_time': nmap_time,
+            'nmap_range_time': nmap_range.get('time_ms', 0) / 1000,
+            'nmap_service_time': nmap_service.get('time_ms', 0) / 1000,
+            'nmap_common_mb': nmap_common_metrics.get('memory_kb', 0) / 1024,
+            'nmap_range_mb': nmap_range_metrics.get('memory_kb', 0) / 1024,
+            'nmap_service_mb': nmap_service_metrics.get('memory_kb', 0) / 1024,
+            'nmap_common_cpu': nmap_common_metrics.get('cpu_percent', 'N/A'),
+            'nmap_range_cpu': nmap_range_metrics.get('cpu_percent', 'N/A'),
+            'nmap_service_cpu': nmap_service_metrics.get('cpu_percent', 'N/A'),
+            'speed_summary': speed_summary,
+            'pentool_ports': pentool.get('open_ports', 0),
+            'nmap_ports': nmap_common.get('open_ports', 0),
+        }))
+
+    def _time_chart_job(self):
+        """Return a render job for the execution time chart, or None without data"""
 
         tests = self.data.get('tests', {})
 
-        labels = ['Общие\nпорты\n(15)', 'Диапазон\n1-100', 'Определение\nсервисов']
-
         # Convert ms to seconds
         pentool_times = [
             tests.get('pentool_common_ports', {}).get('time_ms', 0) / 1000,
@@ -171,209 +549,82 @@ class ResearchDataGenerator:
             tests.get('nmap_service_detection', {}).get('time_ms', 0) / 1000
         ]
 
-        x = np.arange(len(labels))
-        width = 0.35
+        if not any(pentool_times) and not any(nmap_times):
+            print(f"⚠ Skipped: {self.results_dir}/time_comparison.png (no data)")
+            return None
+        return _render_time_chart, (self.results_dir, self.dpi, pentool_times, nmap_times)
+
+    def _architecture_job(self):
+        """Return a render job for the architecture diagram, or None when it is up to date"""
+
+        png = f'{self.results_dir}/architecture_diagram.png'
+        svg = f'{self.results_dir}/architecture_diagram.svg'
+
+        render = _render_architecture_diagram
+        if self.backend == 'graphviz':
+            if shutil.which('dot'):
+                render = _render_architecture_dot
+            else:
+                print("⚠ Graphviz 'dot' not found, drawing the architecture diagram with matplotlib")
+
+        # The diagram is static: it only changes with its drawing code, the DOT source
+        # or the dpi. The stamp also holds a digest of the PNG, so an overwrite by
+        # another writer (analyze_results.py uses the same path) invalidates it.
+        # A failing dot falls back to matplotlib, whose stamp counts as current too
+        key = _architecture_key(render, self.dpi)
+        keys = [key]
+        if render is _render_architecture_dot:
+            keys.append(_architecture_key(_render_architecture_diagram, self.dpi))
+        if os.path.exists(svg) and any(_stamp_matches(png, k) for k in keys):
+            print(f"✓ Up to date: {png}")
+            return None
+        return render, (self.results_dir, self.dpi, key)
+
+    def _memory_chart_job(self):
+        """Return a render job for the memory chart, or None without data"""
+
+        if not any(self._has(name) for name in NMAP_TIME_FILES):
+            print(f"⚠ Skipped: {self.results_dir}/memory_comparison.png (no data)")
+            return None
 
-        fig, ax = plt.subplots(figsize=(12, 7))
+        memory = [
+            self.parse_time_metrics(f'{self.results_dir}/{name}').get('memory_kb', 0) / 1024
+            for name in NMAP_TIME_FILES
+        ]
+        return _render_memory_chart, (self.results_dir, self.dpi, memory)
 
-        bars1 = ax.bar(x - width/2, pentool_times, width, label='Pentool', color='#3498db', alpha=0.8)
-        bars2 = ax.bar(x + width/2, nmap_times, width, label='Nmap', color='#e74c3c', alpha=0.8)
+    def _render_jobs(self, jobs):
+        """Run (func, args) render jobs, in worker processes when there are several CPUs"""
+        jobs = [job for job in jobs if job is not None]
 
-        ax.set_ylabel('Время выполнения (секунды)', fontsize=13, fontweight='bold')
-        ax.set_xlabel('Тип теста', fontsize=13, fontweight='bold')
-        ax.set_title('Сравнение времени выполнения сканирования\nPentool vs Nmap',
-                     fontsize=15, fontweight='bold', pad=20)
-        ax.set_xticks(x)
-        ax.set_xticklabels(labels, fontsize=11)
-        ax.legend(fontsize=12)
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
+        # Each chart is rasterized in its own process; Agg is not thread-safe
+        if len(jobs) > 1 and (os.cpu_count() or 1) >= 2:
+            with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = [executor.submit(func, *args) for func, args in jobs]
+                saved = [future.result() for future in futures]
+        else:
+            saved = [func(*args) for func, args in jobs]
 
-        # Add value labels
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
-                           f'{height:.2f}s',
-                           ha='center', va='bottom', fontsize=10, fontweight='bold')
+        for paths in saved:
+            for path in paths:
+                print(f"✓ Saved: {path}")
 
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/time_comparison.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/time_comparison.png")
+    def create_time_comparison_chart(self):
+        """Create execution time comparison chart"""
+        self._render_jobs([self._time_chart_job()])
 
     def create_architecture_diagram(self):
         """Create detailed system architecture diagram"""
-
-        fig, ax = plt.subplots(figsize=(16, 12))
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.axis('off')
-
-        # Title
-        ax.text(5, 9.5, 'Pentool: Мульти-Агентная Архитектура',
-               ha='center', fontsize=18, fontweight='bold',
-               bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.8))
-
-        # User Layer
-        user_rect = mpatches.FancyBboxPatch((4, 8), 2, 0.6,
-                                            boxstyle="round,pad=0.1",
-                                            edgecolor='black', facecolor='#3498db', linewidth=2)
-        ax.add_patch(user_rect)
-        ax.text(5, 8.3, 'User / Client', ha='center', va='center',
-               fontsize=12, fontweight='bold', color='white')
-
-        # Main Agent
-        main_rect = mpatches.FancyBboxPatch((3.5, 6.5), 3, 0.8,
-                                            boxstyle="round,pad=0.1",
-                                            edgecolor='black', facecolor='#e74c3c', linewidth=2)
-        ax.add_patch(main_rect)
-        ax.text(5, 6.9, 'Main Agent', ha='center', va='center',
-               fontsize=13, fontweight='bold', color='white')
-        ax.text(5, 6.7, '(REST API :8080)', ha='center', va='center',
-               fontsize=9, color='white')
-
-        # NATS Message Broker
-        nats_rect = mpatches.FancyBboxPatch((3.5, 5), 3, 0.8,
-                                            boxstyle="round,pad=0.1",
-                                            edgecolor='black', facecolor='#f39c12', linewidth=2)
-        ax.add_patch(nats_rect)
-        ax.text(5, 5.5, 'NATS Message Broker', ha='center', va='center',
-               fontsize=13, fontweight='bold', color='white')
-        ax.text(5, 5.2, '(Pub/Sub :4222)', ha='center', va='center',
-               fontsize=9, color='white')
-
-        # Worker Agents
-        agents = [
-            ('Scanner Agent', 1.5, 3.5, 'Сканирование\nпортов'),
-            ('Analyzer Agent', 4, 3.5, 'Определение\nсервисов'),
-            ('Reporter Agent', 6.5, 3.5, 'Генерация\nотчетов')
-        ]
-
-        for name, x_pos, y_pos, desc in agents:
-            agent_rect = mpatches.FancyBboxPatch((x_pos, y_pos), 2, 0.8,
-                                                boxstyle="round,pad=0.1",
-                                                edgecolor='black', facecolor='#2ecc71',
-                                                linewidth=2)
-            ax.add_patch(agent_rect)
-            ax.text(x_pos + 1, y_pos + 0.5, name, ha='center', va='center',
-                   fontsize=11, fontweight='bold', color='white')
-            ax.text(x_pos + 1, y_pos + 0.2, desc, ha='center', va='center',
-                   fontsize=8, color='white')
-
-        # Database
-        db_rect = mpatches.FancyBboxPatch((6.5, 1.5), 2, 0.8,
-                                         boxstyle="round,pad=0.1",
-                                         edgecolor='black', facecolor='#9b59b6', linewidth=2)
-        ax.add_patch(db_rect)
-        ax.text(7.5, 2, 'PostgreSQL', ha='center', va='center',
-               fontsize=12, fontweight='bold', color='white')
-        ax.text(7.5, 1.7, 'Database', ha='center', va='center',
-               fontsize=9, color='white')
-
-        # Arrows
-        arrows = [
-            ((5, 8), (5, 7.3), 'HTTP\nREST API', 'black'),
-            ((5, 6.5), (5, 5.8), 'NATS\nPublish', 'black'),
-            ((4.5, 5), (2.5, 4.3), 'scan.request', '#555'),
-            ((5, 5), (5, 4.3), 'scan.result', '#555'),
-            ((5.5, 5), (7.5, 4.3), 'service.info', '#555'),
-            ((7.5, 3.5), (7.5, 2.3), 'SQL\nINSERT', 'black'),
-        ]
-
-        for (x1, y1), (x2, y2), label, color in arrows:
-            ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                       arrowprops=dict(arrowstyle='->', lw=2.5, color=color))
-            mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-            ax.text(mid_x + 0.3, mid_y, label, fontsize=8,
-                   style='italic', color=color, fontweight='bold')
-
-        # Features box
-        features_text = (
-            "Ключевые особенности:\n\n"
-            "✓ Go Concurrency (Goroutines)\n"
-            "✓ Async Message Passing\n"
-            "✓ Distributed Architecture\n"
-            "✓ Horizontal Scalability\n"
-            "✓ Microservices Pattern\n"
-            "✓ Event-Driven Design"
-        )
-
-        ax.text(0.3, 5, features_text, fontsize=9,
-               verticalalignment='top',
-               bbox=dict(boxstyle='round', facecolor='#ecf0f1',
-                        alpha=0.9, edgecolor='black', linewidth=1.5))
-
-        # Tech stack box
-        tech_text = (
-            "Технологии:\n\n"
-            "• Go 1.19+\n"
-            "• NATS Streaming\n"
-            "• PostgreSQL 15\n"
-            "• Docker\n"
-            "• REST API"
-        )
-
-        ax.text(9.7, 5, tech_text, fontsize=9,
-               verticalalignment='top', ha='right',
-               bbox=dict(boxstyle='round', facecolor='#ecf0f1',
-                        alpha=0.9, edgecolor='black', linewidth=1.5))
-
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/architecture_diagram.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/architecture_diagram.png")
+        self._render_jobs([self._architecture_job()])
 
     def create_memory_comparison_chart(self):
         """Create memory usage comparison"""
+        self._render_jobs([self._memory_chart_job()])
 
-        nmap_common_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_common_time.txt')
-        nmap_range_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_range_time.txt')
-        nmap_service_metrics = self.parse_time_metrics(f'{self.results_dir}/nmap_service_time.txt')
-
-        labels = ['Общие\nпорты', 'Диапазон\n1-100', 'Определение\nсервисов']
-        memory = [
-            nmap_common_metrics.get('memory_kb', 0) / 1024,
-            nmap_range_metrics.get('memory_kb', 0) / 1024,
-            nmap_service_metrics.get('memory_kb', 0) / 1024
-        ]
+    def write_feature_comparison_table(self, fh):
+        """Write feature comparison table to fh"""
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.bar(labels, memory, color=['#e74c3c', '#e67e22', '#d35400'], alpha=0.8)
-
-        ax.set_ylabel('Использование памяти (MB)', fontsize=12, fontweight='bold')
-        ax.set_xlabel('Тип теста', fontsize=12, fontweight='bold')
-        ax.set_title('Использование памяти - Nmap', fontsize=14, fontweight='bold')
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-
-        # Add value labels
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{height:.1f} MB',
-                       ha='center', va='bottom', fontsize=11, fontweight='bold')
-
-        plt.tight_layout()
-        plt.savefig(f'{self.results_dir}/memory_comparison.png', dpi=300, bbox_inches='tight')
-        print(f"✓ Saved: {self.results_dir}/memory_comparison.png")
-
-    def create_feature_comparison_table(self):
-        """Create feature comparison table"""
-
-        table = "\n## 4. Сравнение функциональности\n\n"
-        table += "| Функция | Pentool | Nmap | Masscan |\n"
-        table += "|---------|---------|------|----------|\n"
-        table += "| Сканирование портов | ✓ | ✓ | ✓ |\n"
-        table += "| Определение сервисов | ✓ | ✓ | ✗ |\n"
-        table += "| REST API | ✓ | ✗ | ✗ |\n"
-        table += "| Распределенная архитектура | ✓ | ✗ | ✗ |\n"
-        table += "| Горизонтальное масштабирование | ✓ | ✗ | ✗ |\n"
-        table += "| Асинхронная обработка | ✓ | ✗ | ✓ |\n"
-        table += "| Хранение результатов в БД | ✓ | ✗ | ✗ |\n"
-        table += "| Сверхбыстрое сканирование | ✗ | ✗ | ✓ |\n"
-        table += "| OS Detection | ✗ | ✓ | ✗ |\n"
-        table += "| NSE Scripts | ✗ | ✓ | ✗ |\n\n"
-
-        return table
+        fh.write(FEATURE_COMPARISON_MD)
 
     def generate_complete_report(self):
         """Generate complete research paper data"""
@@ -389,18 +640,19 @@ class ResearchDataGenerator:
 
         # Generate markdown report
         print("Creating comparison tables...")
-        report = self.create_comparison_table_md()
-        report += self.create_feature_comparison_table()
-
-        with open(f'{self.results_dir}/research_report.md', 'w', encoding='utf-8') as f:
-            f.write(report)
+        with open(f'{self.results_dir}/research_report.md', 'w', encoding='utf-8') as fh:
+            self.write_comparison_table(fh)
+            self.write_feature_comparison_table(fh)
         print(f"✓ Saved: {self.results_dir}/research_report.md")
 
-        # Generate charts
+        # Generate charts; they are independent, so they are dispatched together
         print("\nGenerating charts...")
-        self.create_time_comparison_chart()
-        self.create_memory_comparison_chart()
-        self.create_architecture_diagram()
+        self._render_jobs([
+            self._time_chart_job(),
+            self._memory_chart_job(),
+            self._architecture_job(),
+        ])
+        _close_figure()
 
         print("\n" + "="*70)
         print("  Analysis Complete!")
@@ -411,12 +663,18 @@ class ResearchDataGenerator:
         print("  📈 time_comparison.png - Execution time comparison chart")
         print("  💾 memory_comparison.png - Memory usage chart")
         print("  🏗️  architecture_diagram.png - System architecture diagram")
+        print("  🏗️  architecture_diagram.svg - System architecture diagram (vector)")
         print("\nData ready for scientific paper!\n")
 
         return True
 
 
 if __name__ == '__main__':
-    generator = ResearchDataGenerator()
+    parser = argparse.ArgumentParser(description='Generate research paper data from benchmark results')
+    parser.add_argument('--backend', choices=['graphviz', 'matplotlib'], default='graphviz',
+                        help='Architecture diagram renderer (falls back to matplotlib without Graphviz)')
+    args = parser.parse_args()
+
+    generator = ResearchDataGenerator(backend=args.backend)
     success = generator.generate_complete_report()
     sys.exit(0 if success else 1)
\ No newline at end of file
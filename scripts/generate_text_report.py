@@ -4,20 +4,390 @@ Text-based Research Report Generator (no matplotlib required)
 Creates comprehensive text analysis for scientific paper
 """
 
+import argparse
 import json
-import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 import os
+import pathlib
+import sys
+
+# orjson is optional; fall back to the stdlib parser when it is not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Static blocks of the text report; *_TMPL blocks are filled in with str.format
+REPORT_HEADER_TMPL = """\
+================================================================================
+  РЕЗУЛЬТАТЫ ТЕСТИРОВАНИЯ PENTOOL
+  Исследование инструментов тестирования на проникновение на Go
+================================================================================
+
+Дата тестирования: {timestamp}
+Цель тестирования: {target}
+"""
+
+PERFORMANCE_TABLE_HEADER = """\
+================================================================================
+1. СРАВНИТЕЛЬНАЯ ТАБЛИЦА ПРОИЗВОДИТЕЛЬНОСТИ
+================================================================================
+
+┌─────────────┬──────────────────────┬───────────┬──────────┬──────────┬─────────────┬─────────┐
+│ Инструмент  │ Тест                 │ Время (мс)│ Время (с)│ Найдено  │ Память (MB) │ CPU (%) │
+├─────────────┼──────────────────────┼───────────┼──────────┼──────────┼─────────────┼─────────┤"""
+
+PERFORMANCE_TABLE_FOOTER = """\
+└─────────────┴──────────────────────┴───────────┴──────────┴──────────┴─────────────┴─────────┘
+"""
+
+ANALYSIS_HEADER = """\
+================================================================================
+2. АНАЛИЗ ПРОИЗВОДИТЕЛЬНОСТИ
+================================================================================
+
+2.1. Скорость сканирования
+--------------------------------------------------------------------------------"""
+
+SPEED_ANALYSIS_TMPL = """\
+  Pentool:      {pentool_time:>6} секунд
+  Nmap:         {nmap_time:>6} секунд
+  Соотношение:  Pentool медленнее в {ratio:.1f}x раз
+
+  Причины:
+  • Overhead распределенной архитектуры (NATS messaging)
+  • Timeout = 1 секунда на порт (можно оптимизировать)
+  • База данных overhead (PostgreSQL INSERT операции)
+"""
+
+RESOURCE_USAGE_TMPL = """\
+2.2. Использование ресурсов
+--------------------------------------------------------------------------------
+
+Память (Memory):
+  Nmap (общие порты):        {common_mb:>6} MB
+  Nmap (диапазон 1-100):     {range_mb:>6} MB
+  Nmap (определение сервисов): {service_mb:>6} MB
+
+Загрузка CPU:
+  Nmap (общие порты):        {common_cpu:>6}%
+  Nmap (диапазон 1-100):     {range_cpu:>6}%
+  Nmap (определение сервисов): {service_cpu:>6}%
+"""
+
+ACCURACY_TMPL = """\
+2.3. Точность обнаружения
+--------------------------------------------------------------------------------
+  Pentool нашел: {pentool_ports} открытых портов
+  Nmap нашел:    {nmap_ports} открытых портов
+"""
+
+MISSED_PORTS_NOTE = """\
+  ⚠ Pentool пропустил некоторые открытые порты
+    Возможные причины:
+    • Короткий timeout (1 сек)
+    • Проблемы с сетевой задержкой
+    • Firewall фильтрация"""
+
+ARCHITECTURE_DIAGRAM = """\
+================================================================================
+3. АРХИТЕКТУРНЫЕ ОСОБЕННОСТИ PENTOOL
+================================================================================
+
+3.1. Мульти-агентная архитектура
+--------------------------------------------------------------------------------
+
+  ┌──────────────────┐
+  │  User / Client   │
+  └────────┬─────────┘
+           │ HTTP REST API
+           ▼
+  ┌──────────────────┐
+  │   Main Agent     │ ◄─── Координация и API
+  │   (port :8080)   │
+  └────────┬─────────┘
+           │ NATS Pub/Sub
+           ▼
+  ┌──────────────────────────────────────┐
+  │    NATS Message Broker (:4222)       │
+  └───┬──────────────┬──────────────┬────┘
+      │              │              │
+      ▼              ▼              ▼
+  ┌────────┐    ┌────────┐    ┌──────────┐
+  │Scanner │    │Analyzer│    │ Reporter │
+  │ Agent  │    │ Agent  │    │  Agent   │
+  └────────┘    └────────┘    └─────┬────┘
+                                     │
+                                     ▼
+                               ┌──────────┐
+                               │PostgreSQL│
+                               └──────────┘
+"""
+
+SYSTEM_COMPONENTS = """\
+3.2. Компоненты системы
+--------------------------------------------------------------------------------
+
+  1) Main Agent:
+     • REST API сервер (порт 8080)
+     • Управление задачами сканирования
+     • Взаимодействие с БД (PostgreSQL)
+
+  2) Scanner Agent:
+     • Параллельное сканирование портов (10 workers)
+     • TCP connect для определения открытых портов
+     • Публикация результатов в NATS
+
+  3) Analyzer Agent:
+     • Определение сервисов по баннерам
+     • Идентификация версий
+     • Fingerprinting
+
+  4) Reporter Agent:
+     • Агрегация результатов
+     • Генерация отчетов (JSON)
+     • Сохранение в PostgreSQL
+"""
+
+FEATURE_COMPARISON_TABLE = """\
+================================================================================
+4. СРАВНЕНИЕ ФУНКЦИОНАЛЬНОСТИ
+================================================================================
+
+┌───────────────────────────────────┬─────────┬──────┬─────────┐
+│ Функция                           │ Pentool │ Nmap │ Masscan │
+├───────────────────────────────────┼─────────┼──────┼─────────┤
+│ Сканирование портов               │    ✓    │  ✓   │    ✓    │
+│ Определение сервисов              │    ✓    │  ✓   │    ✗    │
+│ REST API                          │    ✓    │  ✗   │    ✗    │
+│ Распределенная архитектура        │    ✓    │  ✗   │    ✗    │
+│ Горизонтальное масштабирование    │    ✓    │  ✗   │    ✗    │
+│ Асинхронная обработка             │    ✓    │  ✗   │    ✓    │
+│ Хранение результатов в БД         │    ✓    │  ✗   │    ✗    │
+│ Сверхбыстрое сканирование         │    ✗    │  ✗   │    ✓    │
+│ OS Detection                      │    ✗    │  ✓   │    ✗    │
+│ NSE Scripts                       │    ✗    │  ✓   │    ✗    │
+│ Зрелость проекта                  │  Новый  │ 25+  │   10+   │
+└───────────────────────────────────┴─────────┴──────┴─────────┘
+"""
+
+CONCLUSIONS = """\
+================================================================================
+5. ВЫВОДЫ И РЕКОМЕНДАЦИИ
+================================================================================
+
+5.1. Преимущества Pentool
+--------------------------------------------------------------------------------
+
+  ✓ Современная архитектура:
+    - Мульти-агентная распределенная система
+    - Асинхронная обработка через NATS
+    - Микросервисный подход
+
+  ✓ Масштабируемость:
+    - Горизонтальное масштабирование агентов
+    - Независимое развертывание компонентов
+    - Message-driven коммуникация
+
+  ✓ Интеграция:
+    - RESTful API для внешних систем
+    - PostgreSQL для централизованного хранения
+    - Docker containerization
+
+  ✓ Современные паттерны Go:
+    - Goroutines для параллелизма
+    - Channels для синхронизации
+    - Context для управления жизненным циклом
+
+5.2. Области для улучшения
+--------------------------------------------------------------------------------
+
+  ⚠ Производительность:
+    - Оптимизация timeout (adaptive timeout)
+    - Увеличение maxWorkers (dynamic scaling)
+    - Батчинг операций БД
+
+  ⚠ Точность:
+    - Улучшение алгоритмов обнаружения
+    - Повторные попытки для неустойчивых портов
+    - SYN сканирование (требует привилегий)
+
+  ⚠ Функциональность:
+    - OS fingerprinting
+    - Vulnerability scanning
+    - Custom scripts support
+
+5.3. Use Cases для Pentool
+--------------------------------------------------------------------------------
+
+  Подходит для:
+  • Корпоративные Security Operations Centers (SOC)
+  • Непрерывный мониторинг сетевой безопасности
+  • Интеграция в DevSecOps pipeline
+  • Масштабируемые сканирования больших сетей
+  • Централизованное управление и отчетность
+
+  Не подходит для:
+  • Ad-hoc быстрые проверки (Nmap быстрее)
+  • Массовые интернет-сканирования (Masscan эффективнее)
+  • Детальный анализ одиночных хостов
+
+================================================================================
+6. НАУЧНАЯ ЦЕННОСТЬ ИССЛЕДОВАНИЯ
+================================================================================
+
+  Данная работа демонстрирует:
+
+  1. Применение Go в разработке инструментов безопасности
+     - Эффективное использование concurrency
+     - Низкий memory footprint
+     - Быстрая компиляция и развертывание
+
+  2. Современные архитектурные паттерны
+     - Микросервисы
+     - Event-driven architecture
+     - CQRS (Command Query Responsibility Segregation)
+
+  3. Практическое сравнение с индустриальными стандартами
+     - Объективная оценка производительности
+     - Анализ trade-offs
+     - Рекомендации по применению
+
+================================================================================
+ЗАКЛЮЧЕНИЕ
+================================================================================
+
+Pentool представляет собой современный подход к разработке инструментов
+тестирования на проникновение, демонстрируя преимущества распределенной
+архитектуры и возможности языка Go. Несмотря на текущие ограничения в
+скорости сканирования по сравнению с Nmap, проект показывает потенциал
+для масштабируемых корпоративных решений и интеграции в современные
+DevSecOps процессы.
+
+================================================================================"""
+
+# Sections 3-6 do not depend on the results; joined once at import and
+# written with a single call
+STATIC_SECTIONS = '\n'.join((ARCHITECTURE_DIAGRAM, SYSTEM_COMPONENTS,
+                              FEATURE_COMPARISON_TABLE, CONCLUSIONS))
+
+# Static blocks of the markdown summary
+MD_HEADER_TMPL = """\
+# Результаты тестирования Pentool
+
+**Дата:** {timestamp}  
+**Цель:** {target}  
+
+## 1. Сравнительная таблица производительности
+
+| Инструмент | Тест | Время (мс) | Время (с) | Найдено | Память (MB) | CPU (%) |
+|------------|------|------------|-----------|---------|-------------|---------|"""
+
+MD_CONCLUSIONS = """
+## 2. Преимущества Pentool
+
+- ✓ Мульти-агентная распределенная архитектура
+- ✓ Асинхронная обработка через NATS
+- ✓ Горизонтальная масштабируемость
+- ✓ RESTful API
+- ✓ PostgreSQL для хранения
+- ✓ Современные паттерны Go
+
+## 3. Области для улучшения
+
+- ⚠ Скорость сканирования (оптимизация timeout)
+- ⚠ Параллелизм (увеличение workers)
+- ⚠ Точность обнаружения
+"""
+
+# Static blocks pre-encoded to UTF-8 at import, passed to the writers next to
+# their text so only the dynamic parts are encoded per run
+PERFORMANCE_TABLE_HEADER_BYTES = PERFORMANCE_TABLE_HEADER.encode('utf-8')
+PERFORMANCE_TABLE_FOOTER_BYTES = PERFORMANCE_TABLE_FOOTER.encode('utf-8')
+ANALYSIS_HEADER_BYTES = ANALYSIS_HEADER.encode('utf-8')
+MISSED_PORTS_NOTE_BYTES = MISSED_PORTS_NOTE.encode('utf-8')
+STATIC_SECTIONS_BYTES = STATIC_SECTIONS.encode('utf-8')
+MD_CONCLUSIONS_BYTES = MD_CONCLUSIONS.encode('utf-8')
+
+
+@dataclass(slots=True)
+class Row:
+    """One row of the performance table; None cells are shown as '-'"""
+    tool: str
+    test: str
+    time_ms: int
+    open_ports: int | None
+    memory_mb: float | None = None
+    cpu_percent: int | None = None
+
+
+# Performance table rows, filled in with str.format_map from _row_cells
+TEXT_ROW_TMPL = "│ {tool:<11} │ {test:<20} │ {ms:>9} │ {sec:>8} │ {ports:>8} │ {mem:>11} │ {cpu:>7} │"
+MD_ROW_TMPL = "| {tool} | {test} | {ms} | {sec} | {ports} | {mem} | {cpu} |"
+
+
+def _row_cells(row):
+    """Template fields of a Row, all formatted to strings; missing cells are '-'"""
+    return {
+        'tool': row.tool,
+        'test': row.test,
+        'ms': row.time_ms,
+        'sec': f'{row.time_ms / 1000:.2f}',
+        'ports': '-' if row.open_ports is None else str(row.open_ports),
+        'mem': '-' if row.memory_mb is None else f'{row.memory_mb:.1f}',
+        'cpu': '-' if row.cpu_percent is None else str(row.cpu_percent),
+    }
+
+
+def _fmt_text_row(cells):
+    """Format _row_cells output for the box-drawing text table"""
+    return TEXT_ROW_TMPL.format_map(cells)
+
+
+def _fmt_md_row(cells):
+    """Format _row_cells output for the markdown table"""
+    return MD_ROW_TMPL.format_map(cells)
+
+
+@contextmanager
+def _replacing(path):
+    """Open a temp file next to path for binary writing; it replaces path only
+    once it is fully written, so an existing report is always complete"""
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp, 'wb', buffering=65536) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
 
 class TextReportGenerator:
-    def __init__(self, results_dir='benchmark_results'):
+    def __init__(self, results_dir='benchmark_results', force=False):
         self.results_dir = results_dir
+
+        # Input and output paths, built once
+        results = pathlib.Path(results_dir)
+        self.summary_path = results / 'summary.json'
+        self.time_files = {k: results / f'nmap_{k}_time.txt' for k in ('common', 'range', 'service')}
+        self.report_path = results / 'detailed_research_report.txt'
+        self.md_path = results / 'research_summary.md'
+
+        # Regenerate the reports even when they are newer than their inputs
+        self.force = force
         self.data = {}
+        # Parsed /usr/bin/time metrics by filename
+        self._metric_cache = {}
 
     def load_summary(self):
         """Load summary.json with benchmark results"""
         try:
-            with open(f'{self.results_dir}/summary.json', 'r') as f:
-                self.data = json.load(f)
+            # Raw bytes straight to the parser; read_bytes() reads until EOF
+            self.data = _loads(self.summary_path.read_bytes())
             print("✓ Loaded benchmark summary")
             return True
         except FileNotFoundError:
@@ -25,378 +395,185 @@ class TextReportGenerator:
             return False
 
     def parse_time_metrics(self, filename):
-        """Parse /usr/bin/time output"""
+        """Parse /usr/bin/time output (cached per filename)"""
+        if filename in self._metric_cache:
+            return self._metric_cache[filename]
+
         metrics = {}
         try:
             with open(filename, 'r') as f:
                 content = f.read()
 
-            time_match = re.search(r'Time: (.+)', content)
-            if time_match:
-                metrics['time_str'] = time_match.group(1)
-
-            mem_match = re.search(r'Memory: (\d+) KB', content)
-            if mem_match:
-                metrics['memory_kb'] = int(mem_match.group(1))
-
-            cpu_match = re.search(r'CPU: (\d+)%', content)
-            if cpu_match:
-                metrics['cpu_percent'] = int(cpu_match.group(1))
+            # Fixed "Key: value" lines; the first line of each field wins
+            for line in content.splitlines():
+                if line.startswith('Time: '):
+                    if line[6:]:
+                        metrics.setdefault('time_str', line[6:])
+                elif line.startswith('Memory: '):
+                    value = line[8:].partition(' KB')[0]
+                    if value.isdigit():
+                        metrics.setdefault('memory_kb', int(value))
+                elif line.startswith('CPU: '):
+                    value = line[5:].partition('%')[0]
+                    if value.isdigit():
+                        metrics.setdefault('cpu_percent', int(value))
 
         except FileNotFoundError:
             pass
 
+        self._metric_cache[filename] = metrics
         return metrics
 
+    def _is_up_to_date(self):
+        """Check whether both reports are newer than summary.json, the time files and this script"""
+        try:
+            out_mtime = min(self.report_path.stat().st_mtime, self.md_path.stat().st_mtime)
+            src_mtime = max(self.summary_path.stat().st_mtime, os.stat(__file__).st_mtime)
+        except FileNotFoundError:
+            return False
+
+        # The time files are optional inputs
+        for path in self.time_files.values():
+            try:
+                src_mtime = max(src_mtime, path.stat().st_mtime)
+            except FileNotFoundError:
+                pass
+
+        return out_mtime > src_mtime
+
     def generate_report(self):
         """Generate comprehensive text report"""
 
+        if not self.force and self._is_up_to_date():
+            print(f"✓ Up to date: {self.report_path}")
+            return True
+
         if not self.load_summary():
             return False
 
-        tests = self.data.get('tests', {})
-
-        # Parse metrics
-        nmap_common_m = self.parse_time_metrics(f'{self.results_dir}/nmap_common_time.txt')
-        nmap_range_m = self.parse_time_metrics(f'{self.results_dir}/nmap_range_time.txt')
-        nmap_service_m = self.parse_time_metrics(f'{self.results_dir}/nmap_service_time.txt')
-
-        report = []
-        report.append("="*80)
-        report.append("  РЕЗУЛЬТАТЫ ТЕСТИРОВАНИЯ PENTOOL")
-        report.append("  Исследование инструментов тестирования на проникновение на Go")
-        report.append("="*80)
-        report.append("")
-        report.append(f"Дата тестирования: {self.data.get('timestamp', 'N/A')}")
-        report.append(f"Цель тестирования: {self.data.get('target', 'N/A')}")
-        report.append("")
-
-        report.append("="*80)
-        report.append("1. СРАВНИТЕЛЬНАЯ ТАБЛИЦА ПРОИЗВОДИТЕЛЬНОСТИ")
-        report.append("="*80)
-        report.append("")
-
-        # Table header
-        report.append("┌─────────────┬──────────────────────┬───────────┬──────────┬──────────┬─────────────┬─────────┐")
-        report.append("│ Инструмент  │ Тест                 │ Время (мс)│ Время (с)│ Найдено  │ Память (MB) │ CPU (%) │")
-        report.append("├─────────────┼──────────────────────┼───────────┼──────────┼──────────┼─────────────┼─────────┤")
-
-        # Pentool
-        pentool = tests.get('pentool_common_ports', {})
-        report.append(f"│ Pentool     │ Общие порты (15)     │ {pentool.get('time_ms', 0):>9} │ {pentool.get('time_ms', 0)/1000:>8.2f} │ {pentool.get('open_ports', 0):>8} │ {'-':>11} │ {'-':>7} │")
-
-        # Nmap common
-        nmap_common = tests.get('nmap_common_ports', {})
-        report.append(f"│ Nmap        │ Общие порты (15)     │ {nmap_common.get('time_ms', 0):>9} │ {nmap_common.get('time_ms', 0)/1000:>8.2f} │ {nmap_common.get('open_ports', 0):>8} │ {nmap_common_m.get('memory_kb', 0)/1024:>11.1f} │ {nmap_common_m.get('cpu_percent', 0):>7} │")
-
-        # Nmap range
-        nmap_range = tests.get('nmap_port_range_1_100', {})
-        report.append(f"│ Nmap        │ Диапазон 1-100       │ {nmap_range.get('time_ms', 0):>9} │ {nmap_range.get('time_ms', 0)/1000:>8.2f} │ {nmap_range.get('open_ports', 0):>8} │ {nmap_range_m.get('memory_kb', 0)/1024:>11.1f} │ {nmap_range_m.get('cpu_percent', 0):>7} │")
-
-        # Nmap service
-        nmap_service = tests.get('nmap_service_detection', {})
-        report.append(f"│ Nmap -sV    │ Определение сервисов │ {nmap_service.get('time_ms', 0):>9} │ {nmap_service.get('time_ms', 0)/1000:>8.2f} │ {'-':>8} │ {nmap_service_m.get('memory_kb', 0)/1024:>11.1f} │ {nmap_service_m.get('cpu_percent', 0):>7} │")
-
-        report.append("└─────────────┴──────────────────────┴───────────┴──────────┴──────────┴─────────────┴─────────┘")
-        report.append("")
-
-        report.append("="*80)
-        report.append("2. АНАЛИЗ ПРОИЗВОДИТЕЛЬНОСТИ")
-        report.append("="*80)
-        report.append("")
-
-        # Speed Analysis
-        report.append("2.1. Скорость сканирования")
-        report.append("-" * 80)
-        pentool_time = pentool.get('time_ms', 0) / 1000
-        nmap_time = nmap_common.get('time_ms', 0) / 1000
-
-        if nmap_time > 0:
-            ratio = pentool_time / nmap_time
-            report.append(f"  Pentool:      {pentool_time:>6.2f} секунд")
-            report.append(f"  Nmap:         {nmap_time:>6.2f} секунд")
-            report.append(f"  Соотношение:  Pentool медленнее в {ratio:.1f}x раз")
-            report.append("")
-            report.append("  Причины:")
-            report.append("  • Overhead распределенной архитектуры (NATS messaging)")
-            report.append("  • Timeout = 1 секунда на порт (можно оптимизировать)")
-            report.append("  • База данных overhead (PostgreSQL INSERT операции)")
-            report.append("")
-
-        # Resource usage
-        report.append("2.2. Использование ресурсов")
-        report.append("-" * 80)
-        report.append("")
-        report.append("Память (Memory):")
-        report.append(f"  Nmap (общие порты):        {nmap_common_m.get('memory_kb', 0)/1024:>6.1f} MB")
-        report.append(f"  Nmap (диапазон 1-100):     {nmap_range_m.get('memory_kb', 0)/1024:>6.1f} MB")
-        report.append(f"  Nmap (определение сервисов): {nmap_service_m.get('memory_kb', 0)/1024:>6.1f} MB")
-        report.append("")
-        report.append("Загрузка CPU:")
-        report.append(f"  Nmap (общие порты):        {nmap_common_m.get('cpu_percent', 0):>6}%")
-        report.append(f"  Nmap (диапазон 1-100):     {nmap_range_m.get('cpu_percent', 0):>6}%")
-        report.append(f"  Nmap (определение сервисов): {nmap_service_m.get('cpu_percent', 0):>6}%")
-        report.append("")
-
-        # Accuracy
-        report.append("2.3. Точность обнаружения")
-        report.append("-" * 80)
-        report.append(f"  Pentool нашел: {pentool.get('open_ports', 0)} открытых портов")
-        report.append(f"  Nmap нашел:    {nmap_common.get('open_ports', 0)} открытых портов")
-        report.append("")
-        if pentool.get('open_ports', 0) < nmap_common.get('open_ports', 0):
-            report.append("  ⚠ Pentool пропустил некоторые открытые порты")
-            report.append("    Возможные причины:")
-            report.append("    • Короткий timeout (1 сек)")
-            report.append("    • Проблемы с сетевой задержкой")
-            report.append("    • Firewall фильтрация")
-        report.append("")
-
-        report.append("="*80)
-        report.append("3. АРХИТЕКТУРНЫЕ ОСОБЕННОСТИ PENTOOL")
-        report.append("="*80)
-        report.append("")
-
-        report.append("3.1. Мульти-агентная архитектура")
-        report.append("-" * 80)
-        report.append("")
-        report.append("  ┌──────────────────┐")
-        report.append("  │  User / Client   │")
-        report.append("  └────────┬─────────┘")
-        report.append("           │ HTTP REST API")
-        report.append("           ▼")
-        report.append("  ┌──────────────────┐")
-        report.append("  │   Main Agent     │ ◄─── Координация и API")
-        report.append("  │   (port :8080)   │")
-        report.append("  └────────┬─────────┘")
-        report.append("           │ NATS Pub/Sub")
-        report.append("           ▼")
-        report.append("  ┌──────────────────────────────────────┐")
-        report.append("  │    NATS Message Broker (:4222)       │")
-        report.append("  └───┬──────────────┬──────────────┬────┘")
-        report.append("      │              │              │")
-        report.append("      ▼              ▼              ▼")
-        report.append("  ┌────────┐    ┌────────┐    ┌──────────┐")
-        report.append("  │Scanner │    │Analyzer│    │ Reporter │")
-        report.append("  │ Agent  │    │ Agent  │    │  Agent   │")
-        report.append("  └────────┘    └────────┘    └─────┬────┘")
-        report.append("                                     │")
-        report.append("                                     ▼")
-        report.append("                               ┌──────────┐")
-        report.append("                               │PostgreSQL│")
-        report.append("                               └──────────┘")
-        report.append("")
-
-        report.append("3.2. Компоненты системы")
-        report.append("-" * 80)
-        report.append("")
-        report.append("  1) Main Agent:")
-        report.append("     • REST API сервер (порт 8080)")
-        report.append("     • Управление задачами сканирования")
-        report.append("     • Взаимодействие с БД (PostgreSQL)")
-        report.append("")
-        report.append("  2) Scanner Agent:")
-        report.append("     • Параллельное сканирование портов (10 workers)")
-        report.append("     • TCP connect для определения открытых портов")
-        report.append("     • Публикация результатов в NATS")
-        report.append("")
-        report.append("  3) Analyzer Agent:")
-        report.append("     • Определение сервисов по баннерам")
-        report.append("     • Идентификация версий")
-        report.append("     • Fingerprinting")
-        report.append("")
-        report.append("  4) Reporter Agent:")
-        report.append("     • Агрегация результатов")
-        report.append("     • Генерация отчетов (JSON)")
-        report.append("     • Сохранение в PostgreSQL")
-        report.append("")
-
-        report.append("="*80)
-        report.append("4. СРАВНЕНИЕ ФУНКЦИОНАЛЬНОСТИ")
-        report.append("="*80)
-        report.append("")
-
-        report.append("┌───────────────────────────────────┬─────────┬──────┬─────────┐")
-        report.append("│ Функция                           │ Pentool │ Nmap │ Masscan │")
-        report.append("├───────────────────────────────────┼─────────┼──────┼─────────┤")
-        report.append("│ Сканирование портов               │    ✓    │  ✓   │    ✓    │")
-        report.append("│ Определение сервисов              │    ✓    │  ✓   │    ✗    │")
-        report.append("│ REST API                          │    ✓    │  ✗   │    ✗    │")
-        report.append("│ Распределенная архитектура        │    ✓    │  ✗   │    ✗    │")
-        report.append("│ Горизонтальное масштабирование    │    ✓    │  ✗   │    ✗    │")
-        report.append("│ Асинхронная обработка             │    ✓    │  ✗   │    ✓    │")
-        report.append("│ Хранение результатов в БД         │    ✓    │  ✗   │    ✗    │")
-        report.append("│ Сверхбыстрое сканирование         │    ✗    │  ✗   │    ✓    │")
-        report.append("│ OS Detection                      │    ✗    │  ✓   │    ✗    │")
-        report.append("│ NSE Scripts                       │    ✗    │  ✓   │    ✗    │")
-        report.append("│ Зрелость проекта                  │  Новый  │ 25+  │   10+   │")
-        report.append("└───────────────────────────────────┴─────────┴──────┴─────────┘")
-        report.append("")
-
-        report.append("="*80)
-        report.append("5. ВЫВОДЫ И РЕКОМЕНДАЦИИ")
-        report.append("="*80)
-        report.append("")
-
-        report.append("5.1. Преимущества Pentool")
-        report.append("-" * 80)
-        report.append("")
-        report.append("  ✓ Современная архитектура:")
-        report.append("    - Мульти-агентная распределенная система")
-        report.append("    - Асинхронная обработка через NATS")
-        report.append("    - Микросервисный подход")
-        report.append("")
-        report.append("  ✓ Масштабируемость:")
-        report.append("    - Горизонтальное масштабирование агентов")
-        report.append("    - Независимое развертывание компонентов")
-        report.append("    - Message-driven коммуникация")
-        report.append("")
-        report.append("  ✓ Интеграция:")
-        report.append("    - RESTful API для внешних систем")
-        report.append("    - PostgreSQL для централизованного хранения")
-        report.append("    - Docker containerization")
-        report.append("")
-        report.append("  ✓ Современные паттерны Go:")
-        report.append("    - Goroutines для параллелизма")
-        report.append("    - Channels для синхронизации")
-        report.append("    - Context для управления жизненным циклом")
-        report.append("")
-
-        report.append("5.2. Области для улучшения")
-        report.append("-" * 80)
-        report.append("")
-        report.append("  ⚠ Производительность:")
-        report.append("    - Оптимизация timeout (adaptive timeout)")
-        report.append("    - Увеличение maxWorkers (dynamic scaling)")
-        report.append("    - Батчинг операций БД")
-        report.append("")
-        report.append("  ⚠ Точность:")
-        report.append("    - Улучшение алгоритмов обнаружения")
-        report.append("    - Повторные попытки для неустойчивых портов")
-        report.append("    - SYN сканирование (требует привилегий)")
-        report.append("")
-        report.append("  ⚠ Функциональность:")
-        report.append("    - OS fingerprinting")
-        report.append("    - Vulnerability scanning")
-        report.append("    - Custom scripts support")
-        report.append("")
-
-        report.append("5.3. Use Cases для Pentool")
-        report.append("-" * 80)
-        report.append("")
-        report.append("  Подходит для:")
-        report.append("  • Корпоративные Security Operations Centers (SOC)")
-        report.append("  • Непрерывный мониторинг сетевой безопасности")
-        report.append("  • Интеграция в DevSecOps pipeline")
-        report.append("  • Масштабируемые сканирования больших сетей")
-        report.append("  • Централизованное управление и отчетность")
-        report.append("")
-        report.append("  Не подходит для:")
-        report.append("  • Ad-hoc быстрые проверки (Nmap быстрее)")
-        report.append("  • Массовые интернет-сканирования (Masscan эффективнее)")
-        report.append("  • Детальный анализ одиночных хостов")
-        report.append("")
-
-        report.append("="*80)
-        report.append("6. НАУЧНАЯ ЦЕННОСТЬ ИССЛЕДОВАНИЯ")
-        report.append("="*80)
-        report.append("")
-
-        report.append("  Данная работа демонстрирует:")
-        report.append("")
-        report.append("  1. Применение Go в разработке инструментов безопасности")
-        report.append("     - Эффективное использование concurrency")
-        report.append("     - Низкий memory footprint")
-        report.append("     - Быстрая компиляция и развертывание")
-        report.append("")
-        report.append("  2. Современные архитектурные паттерны")
-        report.append("     - Микросервисы")
-        report.append("     - Event-driven architecture")
-        report.append("     - CQRS (Command Query Responsibility Segregation)")
-        report.append("")
-        report.append("  3. Практическое сравнение с индустриальными стандартами")
-        report.append("     - Объективная оценка производительности")
-        report.append("     - Анализ trade-offs")
-        report.append("     - Рекомендации по применению")
-        report.append("")
-
-        report.append("="*80)
-        report.append("ЗАКЛЮЧЕНИЕ")
-        report.append("="*80)
-        report.append("")
-        report.append("Pentool представляет собой современный подход к разработке инструментов")
-        report.append("тестирования на проникновение, демонстрируя преимущества распределенной")
-        report.append("архитектуры и возможности языка Go. Несмотря на текущие ограничения в")
-        report.append("скорости сканирования по сравнению с Nmap, проект показывает потенциал")
-        report.append("для масштабируемых корпоративных решений и интеграции в современные")
-        report.append("DevSecOps процессы.")
-        report.append("")
-        report.append("="*80)
-
-        # Write report
-        report_text = '\n'.join(report)
-        with open(f'{self.results_dir}/detailed_research_report.txt', 'w', encoding='utf-8') as f:
-            f.write(report_text)
-
-        print("\n" + report_text)
-        print(f"\n✓ Report saved to: {self.results_dir}/detailed_research_report.txt")
+        # Bind the attributes and methods used below to locals
+        data = self.data
+        time_files = self.time_files
+        tests_get = data.get('tests', {}).get
+
+        pentool = tests_get('pentool_common_ports', {})
+        nmap_common = tests_get('nmap_common_ports', {})
+        nmap_range = tests_get('nmap_port_range_1_100', {})
+        nmap_service = tests_get('nmap_service_detection', {})
+
+        # Parse metrics; the reads are independent and I/O-bound
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            nmap_common_m, nmap_range_m, nmap_service_m = executor.map(
+                self.parse_time_metrics,
+                [time_files['common'], time_files['range'], time_files['service']])
+
+        # Performance table, shared by the text and markdown reports
+        pentool_row = Row('Pentool', 'Общие порты (15)',
+                          pentool.get('time_ms', 0), pentool.get('open_ports', 0))
+        common_row = Row('Nmap', 'Общие порты (15)',
+                         nmap_common.get('time_ms', 0), nmap_common.get('open_ports', 0),
+                         nmap_common_m.get('memory_kb', 0) / 1024,
+                         nmap_common_m.get('cpu_percent', 0))
+        range_row = Row('Nmap', 'Диапазон 1-100',
+                        nmap_range.get('time_ms', 0), nmap_range.get('open_ports', 0),
+                        nmap_range_m.get('memory_kb', 0) / 1024,
+                        nmap_range_m.get('cpu_percent', 0))
+        service_row = Row('Nmap -sV', 'Определение сервисов',
+                          nmap_service.get('time_ms', 0), None,
+                          nmap_service_m.get('memory_kb', 0) / 1024,
+                          nmap_service_m.get('cpu_percent', 0))
+        rows = [pentool_row, common_row, range_row, service_row]
+
+        # Each number is formatted once; the text table, the analysis sections
+        # and the markdown table all reuse these strings
+        cells = [_row_cells(row) for row in rows]
+        pentool_cells, common_cells, range_cells, service_cells = cells
+
+        pentool_time = pentool_row.time_ms / 1000
+        nmap_time = common_row.time_ms / 1000
+
+        # Stream each block to the report file as it is produced; blocks are
+        # newline-separated and the file has no trailing newline. The console copy
+        # is printed only once both reports are written, so a stdout failure
+        # cannot cost a report
+        report_path = self.report_path
+        console = []
+        with _replacing(report_path) as f:
+            f_write = f.write
+            out_write = console.append
+
+            def emit(text, encoded=None, end=b'\n'):
+                """Write text (or its pre-encoded bytes) to the report and the console copy"""
+                f_write(text.encode('utf-8') if encoded is None else encoded)
+                f_write(end)
+                out_write(text)
+                out_write('\n')
+
+            emit(REPORT_HEADER_TMPL.format(
+                timestamp=data.get('timestamp', 'N/A'),
+                target=data.get('target', 'N/A')))
+            emit(PERFORMANCE_TABLE_HEADER, encoded=PERFORMANCE_TABLE_HEADER_BYTES)
+            for row_cells in cells:
+                emit(_fmt_text_row(row_cells))
+            emit(PERFORMANCE_TABLE_FOOTER, encoded=PERFORMANCE_TABLE_FOOTER_BYTES)
+            emit(ANALYSIS_HEADER, encoded=ANALYSIS_HEADER_BYTES)
+
+            # Speed Analysis
+            if nmap_time > 0:
+                ratio = pentool_time / nmap_time
+                emit(SPEED_ANALYSIS_TMPL.format(
+                    pentool_time=pentool_cells['sec'], nmap_time=common_cells['sec'], ratio=ratio))
+
+            # Resource usage
+            emit(RESOURCE_USAGE_TMPL.format(
+                common_mb=common_cells['mem'],
+                range_mb=range_cells['mem'],
+                service_mb=service_cells['mem'],
+                common_cpu=common_cells['cpu'],
+                range_cpu=range_cells['cpu'],
+                service_cpu=service_cells['cpu']))
+
+            # Accuracy
+            emit(ACCURACY_TMPL.format(pentool_ports=pentool_row.open_ports,
+                                      nmap_ports=common_row.open_ports))
+            if pentool_row.open_ports < common_row.open_ports:
+                emit(MISSED_PORTS_NOTE, encoded=MISSED_PORTS_NOTE_BYTES)
+            emit("")
+
+            emit(STATIC_SECTIONS, encoded=STATIC_SECTIONS_BYTES, end=b'')
 
         # Also create markdown version
-        self._create_markdown_report(tests, nmap_common_m, nmap_range_m, nmap_service_m)
+        self._create_markdown_report(cells)
+
+        print()
+        sys.stdout.write(''.join(console))
+        print(f"\n✓ Report saved to: {report_path}")
+        print(f"✓ Markdown report saved to: {self.md_path}")
 
         return True
 
-    def _create_markdown_report(self, tests, nmap_common_m, nmap_range_m, nmap_service_m):
+    def _create_markdown_report(self, cells):
         """Create markdown version for easier reading"""
 
-        md = []
-        md.append("# Результаты тестирования Pentool")
-        md.append("")
-        md.append(f"**Дата:** {self.data.get('timestamp', 'N/A')}  ")
-        md.append(f"**Цель:** {self.data.get('target', 'N/A')}  ")
-        md.append("")
-
-        md.append("## 1. Сравнительная таблица производительности")
-        md.append("")
-        md.append("| Инструмент | Тест | Время (мс) | Время (с) | Найдено | Память (MB) | CPU (%) |")
-        md.append("|------------|------|------------|-----------|---------|-------------|---------|")
-
-        pentool = tests.get('pentool_common_ports', {})
-        md.append(f"| Pentool | Общие порты (15) | {pentool.get('time_ms', 0)} | {pentool.get('time_ms', 0)/1000:.2f} | {pentool.get('open_ports', 0)} | - | - |")
-
-        nmap_common = tests.get('nmap_common_ports', {})
-        md.append(f"| Nmap | Общие порты (15) | {nmap_common.get('time_ms', 0)} | {nmap_common.get('time_ms', 0)/1000:.2f} | {nmap_common.get('open_ports', 0)} | {nmap_common_m.get('memory_kb', 0)/1024:.1f} | {nmap_common_m.get('cpu_percent', 0)} |")
-
-        nmap_range = tests.get('nmap_port_range_1_100', {})
-        md.append(f"| Nmap | Диапазон 1-100 | {nmap_range.get('time_ms', 0)} | {nmap_range.get('time_ms', 0)/1000:.2f} | {nmap_range.get('open_ports', 0)} | {nmap_range_m.get('memory_kb', 0)/1024:.1f} | {nmap_range_m.get('cpu_percent', 0)} |")
-
-        nmap_service = tests.get('nmap_service_detection', {})
-        md.append(f"| Nmap -sV | Определение сервисов | {nmap_service.get('time_ms', 0)} | {nmap_service.get('time_ms', 0)/1000:.2f} | - | {nmap_service_m.get('memory_kb', 0)/1024:.1f} | {nmap_service_m.get('cpu_percent', 0)} |")
-
-        md.append("")
-        md.append("## 2. Преимущества Pentool")
-        md.append("")
-        md.append("- ✓ Мульти-агентная распределенная архитектура")
-        md.append("- ✓ Асинхронная обработка через NATS")
-        md.append("- ✓ Горизонтальная масштабируемость")
-        md.append("- ✓ RESTful API")
-        md.append("- ✓ PostgreSQL для хранения")
-        md.append("- ✓ Современные паттерны Go")
-        md.append("")
-
-        md.append("## 3. Области для улучшения")
-        md.append("")
-        md.append("- ⚠ Скорость сканирования (оптимизация timeout)")
-        md.append("- ⚠ Параллелизм (увеличение workers)")
-        md.append("- ⚠ Точность обнаружения")
-        md.append("")
-
-        with open(f'{self.results_dir}/research_summary.md', 'w', encoding='utf-8') as f:
-            f.write('\n'.join(md))
-
-        print(f"✓ Markdown report saved to: {self.results_dir}/research_summary.md")
+        md_path = self.md_path
+        with _replacing(md_path) as f:
+            f.write(MD_HEADER_TMPL.format(
+                timestamp=self.data.get('timestamp', 'N/A'),
+                target=self.data.get('target', 'N/A')).encode('utf-8'))
+            f.write(b'\n')
+            for row_cells in cells:
+                f.write(_fmt_md_row(row_cells).encode('utf-8'))
+                f.write(b'\n')
+            f.write(MD_CONCLUSIONS_BYTES)
 
 
 if __name__ == '__main__':
-    generator = TextReportGenerator()
+    parser = argparse.ArgumentParser(description='Generate the text and markdown research reports')
+    parser.add_argument('--results-dir', default='benchmark_results',
+                        help='directory with benchmark results (default: benchmark_results)')
+    parser.add_argument('--force', action='store_true',
+                        help='regenerate the reports even if they are newer than their inputs')
+    args = parser.parse_args()
+
+    generator = TextReportGenerator(results_dir=args.results_dir, force=args.force)
     generator.generate_report()
\ No newline at end of file